@@ -0,0 +1,40 @@
+import argparse
+import json
+import sys
+
+from src.model.Batch import Batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solves a batch of multi-agent pathfinding instances in parallel.")
+    parser.add_argument("instances", nargs="?", default="-",
+                        help="JSON list or JSON lines file of instances, standard input if omitted")
+    parser.add_argument("-o", "--output", default="-", help="JSON lines file to write results to, standard output "
+                                                            "if omitted")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("-t", "--time-limit", type=float, default=None, help="time limit of each instance in seconds")
+    parser.add_argument("-e", "--expansion-limit", type=int, default=None,
+                        help="number of constraint tree nodes each instance may expand")
+    parser.add_argument("--no-paths", action="store_true", help="leave the paths out of the results")
+    args = parser.parse_args()
+
+    if args.instances == "-":
+        instances = Batch.loadInstances(sys.stdin)
+    else:
+        with open(args.instances, 'r') as file:
+            instances = Batch.loadInstances(file)
+
+    output = sys.stdout if args.output == "-" else open(args.output, 'w')
+    try:
+        for result in Batch(args.workers, args.time_limit, args.expansion_limit).run(instances):
+            if args.no_paths:
+                del result["paths"]
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+import random
+
+from src.model.graph.Graph import Graph
+from src.model.agents.cbs.CBSUtils import State, Location
+
+
+def createInstance(seed, size, density, agents):
+    """
+    Creates a random square maze with random waypoints.
+
+    :param seed: The seed of the random number generator.
+    :param size: The width and height of the maze.
+    :param density: The fraction of cells that are obstacles.
+    :param agents: The number of agents.
+    :return: Tuple of the maze and the waypoints of the agents.
+    """
+
+    rng = random.Random(seed)
+    graph = Graph()
+    graph.create(size, size)
+
+    cells = list(range(size * size))
+    rng.shuffle(cells)
+    obstacles = int(size * size * density)
+    for cell in cells[:obstacles]:
+        graph.setObstacle(cell, True)
+
+    free = cells[obstacles:]
+    waypoints = {}
+    for agent in range(agents):
+        start = divmod(free[2 * agent], size)
+        goal = divmod(free[2 * agent + 1], size)
+        waypoints[f"agent{agent + 1}"] = {"start": State(0, Location(*start)), "goal": State(0, Location(*goal))}
+    return graph, waypoints
@@ -0,0 +1,61 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def measure(command, repeats):
+    """
+    Measures the median wall time of running a command in a new process.
+
+    :param command: The command to run.
+    :param repeats: The number of times to run the command.
+    :return: The median wall time in seconds.
+    """
+
+    times = []
+    for _ in range(repeats):
+        startTime = time.perf_counter()
+        subprocess.run(command, check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - startTime)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the cold start of the headless solver against a bare "
+                                                 "interpreter.")
+    parser.add_argument("--repeats", type=int, default=20, help="number of runs of each command")
+    parser.add_argument("--limit", type=float, default=0.1, help="seconds the headless solver may add to the start "
+                                                                 "of the interpreter")
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile('w', suffix=".json", delete=False) as file:
+        json.dump({"width": 8, "height": 8, "obstacles": [], "agents": {"agent1": {"start": [0, 0], "goal": [7, 7]}}},
+                  file)
+    try:
+        headless = [sys.executable, "-m", "headless", file.name, "--no-paths"]
+
+        imports = subprocess.run([sys.executable, "-X", "importtime"] + headless[1:], check=False,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True).stderr
+        if "PyQt5" in imports:
+            raise RuntimeError("the headless solver imports PyQt5")
+
+        interpreterTime = measure([sys.executable, "-c", "pass"], args.repeats)
+        headlessTime = measure(headless, args.repeats)
+    finally:
+        os.remove(file.name)
+
+    overhead = headlessTime - interpreterTime
+    print(f"{'interpreter (ms)':>18} {'headless (ms)':>14} {'overhead (ms)':>14}")
+    print(f"{interpreterTime * 1000:>18.1f} {headlessTime * 1000:>14.1f} {overhead * 1000:>14.1f}")
+    if overhead > args.limit:
+        print(f"cold start overhead exceeds {args.limit * 1000:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
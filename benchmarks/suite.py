@@ -0,0 +1,176 @@
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks.instances import createInstance
+from src.model.agents.Budget import Budget
+from src.model.agents.SingleAgent import SingleAgent
+from src.model.agents.cbs.CBS import CBS
+
+SEARCHES = {"dfs": 0, "bfs": 1, "astar": 2, "cbs": None}
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+NOTES = {"expanded": "nodes expanded by the search; for CBS, constraint tree nodes only, not low-level expansions",
+         "ctNodes": "constraint tree nodes generated by CBS, 0 for single-agent searches"}
+
+
+def runSearch(search, graph, waypoints, timeLimit, expansionLimit):
+    """
+    Runs a search on an instance, timing only the search itself.
+
+    The instance should be newly created, so the search does not reuse the distance tables of another.
+
+    :param search: The name of the search.
+    :param graph: The maze of the instance.
+    :param waypoints: The waypoints of the agents, only the first is used by single-agent searches.
+    :param timeLimit: The time limit of the search in seconds, None for no limit.
+    :param expansionLimit: The number of constraint tree nodes CBS may expand, None for no limit.
+    :return: Tuple of the search result, the statistics of the search and its wall time in seconds.
+    """
+
+    if search == "cbs":
+        solver = CBS()
+        budget = Budget(timeLimit, expansionLimit)
+        startTime = time.perf_counter()
+        result = solver.solve(graph, waypoints, budget)
+    else:
+        width = graph.width
+        start = waypoints["agent1"]["start"].location
+        goal = waypoints["agent1"]["goal"].location
+        solver = SingleAgent()
+        budget = Budget(timeLimit)
+        startTime = time.perf_counter()
+        result = solver.solve(graph, SEARCHES[search], start.x * width + start.y, goal.x * width + goal.y, budget)
+    return result, result.statistics, time.perf_counter() - startTime
+
+
+def runCase(search, size, density, agents, seeds, timeLimit, expansionLimit):
+    """
+    Measures a search over the instances of each seed.
+
+    Each instance is created twice outside of the measurements, and searched once for the wall time
+    and node counts and once under tracemalloc for the peak memory, as tracing slows the search down.
+
+    :param search: The name of the search.
+    :param size: The width and height of the maze.
+    :param density: The fraction of cells that are obstacles.
+    :param agents: The number of agents.
+    :param seeds: The seeds of the instances.
+    :param timeLimit: The time limit of each search in seconds, None for no limit.
+    :param expansionLimit: The number of constraint tree nodes each CBS search may expand, None for no limit.
+    :return: Dictionary of the total time, nodes expanded and constraint tree nodes, the peak memory and the statuses.
+        For CBS, the nodes expanded are constraint tree nodes, not the expansions of the low-level searches.
+    """
+
+    case = {"time": 0.0, "expanded": 0, "ctNodes": 0, "peakMemory": 0, "statuses": {}}
+    for seed in seeds:
+        graph, waypoints = createInstance(seed, size, density, agents)
+        result, statistics, elapsed = runSearch(search, graph, waypoints, timeLimit, expansionLimit)
+        case["time"] += elapsed
+        case["expanded"] += statistics["expanded"]
+        case["ctNodes"] += statistics.get("generated", 0)
+        case["statuses"][result.status] = case["statuses"].get(result.status, 0) + 1
+
+        graph, waypoints = createInstance(seed, size, density, agents)
+        tracemalloc.start()
+        try:
+            runSearch(search, graph, waypoints, timeLimit, expansionLimit)
+            case["peakMemory"] = max(case["peakMemory"], tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    return case
+
+
+def compare(results, baseline, tolerance, timeFloor):
+    """
+    Compares results against a baseline.
+
+    Node counts and statuses are deterministic for fixed seeds, so any increase in node counts and
+    any change in the statuses is a regression. Wall time and peak memory vary between runs, so
+    they regress only when they exceed the baseline by more than the tolerance, and wall time must
+    also grow by more than a floor that absorbs timer noise.
+
+    :param results: The cases of the current run.
+    :param baseline: The cases of the baseline.
+    :param tolerance: The fraction wall time and peak memory may exceed the baseline by.
+    :param timeFloor: The number of seconds wall time may grow by regardless of the tolerance.
+    :return: List of the descriptions of each regression.
+    """
+
+    regressions = []
+    for name, case in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in ("expanded", "ctNodes"):
+            if case[metric] > previous[metric]:
+                regressions.append(f"{name}: {metric} {previous[metric]} -> {case[metric]}")
+        if case["statuses"] != previous["statuses"]:
+            regressions.append(f"{name}: statuses {previous['statuses']} -> {case['statuses']}")
+        if case["peakMemory"] > previous["peakMemory"] * (1 + tolerance):
+            regressions.append(f"{name}: peakMemory {previous['peakMemory']} -> {case['peakMemory']}")
+        if case["time"] > previous["time"] * (1 + tolerance) and case["time"] - previous["time"] > timeFloor:
+            regressions.append(f"{name}: time {previous['time']:.4f}s -> {case['time']:.4f}s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the single-agent searches and CBS over fixed random "
+                                                 "instances, flagging regressions against a stored baseline.")
+    parser.add_argument("--searches", nargs="+", choices=list(SEARCHES), default=list(SEARCHES),
+                        help="searches to measure")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 32], help="widths and heights of the maze")
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.1, 0.2],
+                        help="fractions of cells that are obstacles")
+    parser.add_argument("--agents", type=int, nargs="+", default=[4, 8], help="numbers of agents for CBS")
+    parser.add_argument("--seeds", type=int, default=5, help="number of instances of each case")
+    parser.add_argument("--time-limit", type=float, default=None,
+                        help="time limit of each search in seconds, which makes node counts depend on the machine")
+    parser.add_argument("--expansion-limit", type=int, default=1000,
+                        help="number of constraint tree nodes each CBS search may expand")
+    parser.add_argument("-o", "--output", default="benchmark-results.json", help="file to write the results to")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline results to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results to the baseline instead "
+                                                                       "of comparing against it")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="fraction wall time and peak memory may exceed the baseline by")
+    parser.add_argument("--time-floor", type=float, default=0.01,
+                        help="seconds wall time may grow by regardless of the tolerance")
+    args = parser.parse_args()
+
+    seeds = list(range(args.seeds))
+    results = {}
+    print(f"{'case':<36} {'time (s)':>10} {'expanded':>10} {'CT nodes':>10} {'memory (KiB)':>13}")
+    for search, size, density in itertools.product(args.searches, args.sizes, args.densities):
+        for agents in (args.agents if search == "cbs" else [1]):
+            name = f"{search} size={size} density={density}" + (f" agents={agents}" if search == "cbs" else "")
+            case = runCase(search, size, density, agents, seeds, args.time_limit, args.expansion_limit)
+            results[name] = case
+            print(f"{name:<36} {case['time']:>10.4f} {case['expanded']:>10} {case['ctNodes']:>10} "
+                  f"{case['peakMemory'] / 1024:>13.1f}")
+
+    report = {"date": datetime.datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+              "platform": platform.platform(), "seeds": args.seeds, "timeLimit": args.time_limit,
+              "expansionLimit": args.expansion_limit, "notes": NOTES, "cases": results}
+    with open(args.baseline if args.update_baseline else args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        return
+
+    with open(args.baseline, 'r') as file:
+        baseline = json.load(file)
+    regressions = compare(results, baseline["cases"], args.tolerance, args.time_floor)
+    for regression in regressions:
+        print("regression: " + regression)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
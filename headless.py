@@ -0,0 +1,109 @@
+import argparse
+import json
+import sys
+
+from src.model.Solver import Solver
+
+
+def parseCell(text):
+    """
+    Parses a cell given as "row,column".
+
+    :param text: The text of the cell.
+    :return: List of the row and column of the cell.
+    """
+
+    try:
+        row, column = text.split(",")
+        return [int(row), int(column)]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"cell {text!r} is not of the form row,column")
+
+
+def loadJSON(path):
+    """
+    Reads a JSON file, or standard input if the path is "-".
+
+    :param path: The path of the file.
+    :return: The decoded JSON value.
+    """
+
+    if path == "-":
+        return json.load(sys.stdin)
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solves a pathfinding instance without the user interface and "
+                                                 "writes its result as JSON.")
+    parser.add_argument("map", help="MovingAI .map file, or JSON file of the maze with its width, height and "
+                                    "obstacles, standard input if -; an instance file may also hold its agents and "
+                                    "solver options")
+    parser.add_argument("-s", "--scenario", help="MovingAI .scen file, or JSON file whose agents replace those of "
+                                                 "the map file")
+    parser.add_argument("-n", "--agents", type=int, default=None, help="number of problems of a .scen file to "
+                                                                       "solve, all if omitted")
+    parser.add_argument("-b", "--bucket", type=int, action="append", help="take the problems of a .scen file from "
+                                                                          "this bucket, may be repeated")
+    parser.add_argument("-a", "--agent", nargs=2, action="append", type=parseCell, metavar=("START", "GOAL"),
+                        help="add an agent from START to GOAL, both given as row,column")
+    parser.add_argument("--search", choices=["cbs", "dfs", "bfs", "astar"], default=None,
+                        help="search to use, cbs unless the map file sets one")
+    parser.add_argument("--suboptimality", type=float, default=None,
+                        help="factor the cost may exceed the optimal cost by, above 1 for ECBS")
+    parser.add_argument("--prioritise-conflicts", action="store_true", help="split on cardinal conflicts first")
+    parser.add_argument("--bypass-conflicts", action="store_true", help="adopt a child's path instead of branching")
+    parser.add_argument("--disjoint-splitting", action="store_true", help="split conflicts into positive and "
+                                                                          "negative constraints")
+    parser.add_argument("-t", "--time-limit", type=float, default=None, help="time limit in seconds")
+    parser.add_argument("-e", "--expansion-limit", type=int, default=None, help="number of nodes the search may "
+                                                                                 "expand")
+    parser.add_argument("-o", "--output", default="-", help="file to write the result to, standard output if "
+                                                            "omitted")
+    parser.add_argument("--no-paths", action="store_true", help="leave the paths out of the result")
+    args = parser.parse_args()
+
+    if args.map.endswith(".map"):
+        instance = {"map": args.map}
+    else:
+        instance = loadJSON(args.map)
+    if args.scenario is not None and args.scenario.endswith(".scen"):
+        instance.pop("agents", None)
+        instance["scenario"] = args.scenario
+        instance["agentCount"] = args.agents
+        instance["buckets"] = args.bucket
+    elif args.scenario is not None:
+        instance["agents"] = loadJSON(args.scenario)["agents"]
+    if args.agent:
+        agents = instance.setdefault("agents", {})
+        for start, goal in args.agent:
+            agents[f"agent{len(agents) + 1}"] = {"start": start, "goal": goal}
+    if args.search is not None:
+        instance["search"] = args.search
+
+    solver = instance.setdefault("solver", {})
+    if args.suboptimality is not None:
+        solver["suboptimality"] = args.suboptimality
+    flags = {"prioritiseConflicts": args.prioritise_conflicts, "bypassConflicts": args.bypass_conflicts,
+             "disjointSplitting": args.disjoint_splitting}
+    for option, enabled in flags.items():
+        if enabled:
+            solver[option] = True
+
+    result = Solver(args.time_limit, args.expansion_limit).solveInstance(instance)
+    if args.no_paths:
+        del result["paths"]
+
+    output = sys.stdout if args.output == "-" else open(args.output, 'w')
+    try:
+        output.write(json.dumps(result) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    return 0 if result["status"] == "solved" else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,6 +5,8 @@ from PyQt5.QtCore import QTimer
 import src.model.Model as Model
 import src.view.View as View
 
+from src.controller.SearchWorker import SearchWorker
+from src.model.Animation import Animation
 from src.model.agents.cbs.CBSUtils import *
 
 
@@ -15,11 +17,13 @@ class Controller:
     Attributes:
         model (Model): The model of the MVC architecture.
         view (View): The view of the MVC architecture.
-        maxIterations (int): Number of iterations in the search animation.
-        currentIteration (int): Counter for the current iteration number.
+        animation (Animation): The frames of the current solution, None when no solution is displayed.
+        currentIteration (int): The timestep the animation displays, None when no solution is displayed.
         timer (QTimer): QTimer object for the timer of the animation.
         currentSASearchType (int): The current Single-Agent Search type.
         currentMAAgentNumber (int): The current number of agents in the Multi-Agent Search.
+        worker (SearchWorker): The worker running the current search, None when no search is running.
+        searchMenu (QWidget): The menu that started the current search.
 
     Methods:
         __init__(self, model, view): Initializes the controller class.
@@ -35,6 +39,16 @@ class Controller:
         setMAAgentNumber(self, number): Sets the number of agents in the Multi-Agent Search.
         playMultiAgentSearch(self): Play a Multi-Agent search animation.
         playAgentAnimation(agent): Play an animation on the current solution.
+        seekAnimation(self, step): Displays a given timestep of the animation.
+        setAnimationSpeed(self, speed): Sets the number of timesteps the animation plays per second.
+        clearAnimation(self): Stops and discards the animation.
+        startSearch(self, menu, search): Runs a search in a background worker.
+        setSearching(self, searching): Enables or disables the controls that change the maze.
+        showSearchProgress(self, expansions, elapsed): Displays the progress of the current search.
+        finishSearch(self, result): Displays the result of the current search and plays its animation.
+        failSearch(self, error): Displays the error that stopped the current search.
+        clearSearch(self): Releases the worker of the finished search.
+        cancelSearch(self): Cancels the current search.
     """
 
     def __init__(self, model: Model, view: View):
@@ -48,8 +62,8 @@ class Controller:
         self.model = model
         self.view = view
 
-        self.maxIterations = 0
-        self.currentIteration = 0
+        self.animation = None
+        self.currentIteration = None
 
         self.timer = QTimer()
         self.timer.timeout.connect(self.playAgentAnimation)
@@ -58,6 +72,9 @@ class Controller:
 
         self.currentMAAgentNumber = 4
 
+        self.worker = None
+        self.searchMenu = None
+
         self.view.sidebar.SAButton.clicked.connect(self.setSingleAgent)
         self.view.sidebar.MAButton.clicked.connect(self.setMultiAgent)
 
@@ -67,11 +84,17 @@ class Controller:
         self.view.singleAgentMenu.searchSelectButtonGroup.buttonClicked[int].connect(self.setSingleAgentSearch)
         self.view.singleAgentMenu.randomiseButton.clicked.connect(self.setRandomSingleAgent)
         self.view.singleAgentMenu.playButton.clicked.connect(self.playSingleAgentSearch)
+        self.view.singleAgentMenu.cancelButton.clicked.connect(self.cancelSearch)
+        self.view.singleAgentMenu.speedSlider.valueChanged.connect(self.setAnimationSpeed)
+        self.view.singleAgentMenu.seekSlider.valueChanged.connect(self.seekAnimation)
 
         self.view.multiAgentMenu.mazeSelectButtonGroup.buttonClicked[int].connect(self.setMaze)
         self.view.multiAgentMenu.agentNumberButtonGroup.buttonClicked[int].connect(self.setMAAgentNumber)
         self.view.multiAgentMenu.randomiseButton.clicked.connect(self.setRandomMASearch)
         self.view.multiAgentMenu.playButton.clicked.connect(self.playMultiAgentSearch)
+        self.view.multiAgentMenu.cancelButton.clicked.connect(self.cancelSearch)
+        self.view.multiAgentMenu.speedSlider.valueChanged.connect(self.setAnimationSpeed)
+        self.view.multiAgentMenu.seekSlider.valueChanged.connect(self.seekAnimation)
 
         self.view.maze.cellClicked.connect(self.setObstacle)
 
@@ -107,6 +130,11 @@ class Controller:
         :param size: Size of the maze.
         """
 
+        if self.worker is not None:
+            return
+
+        self.clearAnimation()
+
         if size == 0:
             self.model.setMaze(8, 8)
             self.view.maze.drawMaze(8, 8)
@@ -125,8 +153,11 @@ class Controller:
         :param y: The y coordinate of the node.
         """
 
+        if self.worker is not None:
+            return
+
         self.model.setObstacle(x * self.model.maze.width + y)
-        if self.model.maze.nodes[x * self.model.maze.width + y].obstacle:
+        if self.model.maze.isObstacle(x * self.model.maze.width + y):
             self.view.maze.changeCell(x, y, "#20111B")
         else:
             self.view.maze.changeCell(x, y, "white")
@@ -154,7 +185,7 @@ class Controller:
 
         for obstacle in obstacles:
             self.model.setObstacle(obstacle)
-            x, y = divmod(obstacle, dimensions[1])
+            x, y = divmod(obstacle, dimensions[0])
             self.view.maze.changeCell(x, y, "#20111B")
 
         return obstacles, nodeTotal
@@ -203,12 +234,9 @@ class Controller:
 
         start = int(self.view.singleAgentMenu.agentStart.text())
         goal = int(self.view.singleAgentMenu.agentGoal.text())
-        self.model.setSingleAgentPath(self.currentSASearchType, start, goal)
-
-        if self.model.currentSolution:
-            self.maxIterations = max(len(agent_positions) for agent_positions in self.model.currentSolution.values())
-            self.currentIteration = 0
-            self.timer.start(300)
+        search = self.currentSASearchType
+        self.startSearch(self.view.singleAgentMenu,
+                         lambda budget: self.model.setSingleAgentPath(search, start, goal, budget))
 
     def setMAAgentNumber(self, number: int):
         """
@@ -258,41 +286,162 @@ class Controller:
         for agent in range(1, self.currentMAAgentNumber + 1):
             agentStart = int(getattr(self.view.multiAgentMenu, f"agent{agent}Start").text())
             agentGoal = int(getattr(self.view.multiAgentMenu, f"agent{agent}Goal").text())
-            xStart, yStart = divmod(agentStart, self.model.maze.height)
-            xGoal, yGoal = divmod(agentGoal, self.model.maze.height)
+            xStart, yStart = divmod(agentStart, self.model.maze.width)
+            xGoal, yGoal = divmod(agentGoal, self.model.maze.width)
             waypoints[f"agent{agent}"] = {
                 "start": State(0, Location(xStart, yStart)),
                 "goal": State(0, Location(xGoal, yGoal))
             }
 
-        self.model.setMultiAgentPath(waypoints)
-
-        if self.model.currentSolution:
-            self.maxIterations = max(len(agent_positions) for agent_positions in self.model.currentSolution.values())
-            self.currentIteration = 0
-            self.timer.start(300)
+        self.startSearch(self.view.multiAgentMenu,
+                         lambda budget: self.model.setMultiAgentPath(waypoints, budget=budget))
 
     def playAgentAnimation(self):
         """
-        Play an agent animation.
-        """
-
-        if self.maxIterations != 0:
-            previousPositions = []
-            currentPositions = []
-            for agent, positions in self.model.currentSolution.items():
-                if self.currentIteration < len(positions):
-                    currentPosition = positions[self.currentIteration]
-                    agentName = agent.replace("agent", "")
-                    currentPositions.append((currentPosition['x'], currentPosition['y'], "#BE100E", agentName))
-                    if self.currentIteration != 0:
-                        previousPosition = positions[self.currentIteration - 1]
-                        previousPositions.append((previousPosition['x'], previousPosition['y'], "white", ""))
-            for previous in previousPositions:
-                self.view.maze.changeCell(previous[0], previous[1], previous[2], previous[3])
-            for current in currentPositions:
-                self.view.maze.changeCell(current[0], current[1], current[2], current[3])
+        Play an agent animation, applying the changes of the next timestep in a single repaint.
+        """
+
+        if self.animation is not None and self.currentIteration + 1 < self.animation.length:
             self.currentIteration += 1
-            self.maxIterations -= 1
+            self.view.maze.changeCells(self.animation.getFrame(self.currentIteration))
+
+            seekSlider = self.searchMenu.seekSlider
+            seekSlider.blockSignals(True)
+            seekSlider.setValue(self.currentIteration)
+            seekSlider.blockSignals(False)
         else:
             self.timer.stop()
+
+    def seekAnimation(self, step: int):
+        """
+        Displays a given timestep of the animation, applying only the cells that differ from the current timestep.
+
+        :param step: The timestep to display.
+        """
+
+        if self.animation is None or step == self.currentIteration:
+            return
+
+        self.view.maze.changeCells(self.animation.seek(self.currentIteration, step))
+        self.currentIteration = step
+
+    def setAnimationSpeed(self, speed: int):
+        """
+        Sets the number of timesteps the animation plays per second.
+
+        :param speed: The number of timesteps per second.
+        """
+
+        self.timer.setInterval(1000 // speed)
+
+    def clearAnimation(self):
+        """
+        Stops and discards the animation, as it no longer matches the maze.
+        """
+
+        self.timer.stop()
+        self.animation = None
+        self.currentIteration = None
+
+        for menu in (self.view.singleAgentMenu, self.view.multiAgentMenu):
+            menu.seekSlider.blockSignals(True)
+            menu.seekSlider.setRange(0, 0)
+            menu.seekSlider.blockSignals(False)
+            menu.seekSlider.setEnabled(False)
+
+    def startSearch(self, menu, search):
+        """
+        Runs a search in a background worker, so the interface stays responsive while it runs.
+
+        :param menu: The menu that started the search, which displays its progress.
+        :param search: The search to run, called with a budget and returning a search result.
+        """
+
+        self.searchMenu = menu
+        self.searchMenu.statusLabel.setText("Searching...")
+
+        self.worker = SearchWorker(search)
+        self.worker.progress.connect(self.showSearchProgress)
+        self.worker.solved.connect(self.finishSearch)
+        self.worker.failed.connect(self.failSearch)
+        self.worker.finished.connect(self.clearSearch)
+
+        self.setSearching(True)
+        self.worker.start()
+
+    def setSearching(self, searching: bool):
+        """
+        Enables or disables the controls that change the maze, as the maze must not change during a search.
+
+        :param searching: Whether a search is running.
+        """
+
+        for menu in (self.view.singleAgentMenu, self.view.multiAgentMenu):
+            for button in menu.mazeSelectButtonGroup.buttons():
+                button.setEnabled(not searching)
+            menu.randomiseButton.setEnabled(not searching)
+            menu.playButton.setEnabled(not searching)
+            menu.cancelButton.setEnabled(searching)
+
+    def showSearchProgress(self, expansions: int, elapsed: float):
+        """
+        Displays the progress of the current search.
+
+        :param expansions: The number of nodes expanded so far.
+        :param elapsed: The number of seconds the search has run for.
+        """
+
+        self.searchMenu.statusLabel.setText(f"Searching: {expansions} nodes, {elapsed:.1f}s")
+
+    def finishSearch(self, result):
+        """
+        Displays the result of the current search and plays its animation if it was solved.
+
+        :param result: The result of the search.
+        """
+
+        if result is None:
+            self.searchMenu.statusLabel.setText("")
+            return
+
+        self.searchMenu.statusLabel.setText(f"{result.status.capitalize()}: cost {result.cost}, {result.time:.2f}s")
+
+        if result.isSolved() and self.model.currentSolution:
+            self.animation = Animation(self.model.currentSolution)
+            self.currentIteration = 0
+            self.view.maze.changeCells(self.animation.getFrame(0))
+
+            seekSlider = self.searchMenu.seekSlider
+            seekSlider.blockSignals(True)
+            seekSlider.setRange(0, self.animation.length - 1)
+            seekSlider.setValue(0)
+            seekSlider.blockSignals(False)
+            seekSlider.setEnabled(True)
+
+            self.timer.start(1000 // self.searchMenu.speedSlider.value())
+
+    def failSearch(self, error: str):
+        """
+        Displays the error that stopped the current search.
+
+        :param error: The description of the error.
+        """
+
+        self.searchMenu.statusLabel.setText("Search failed: " + error)
+
+    def clearSearch(self):
+        """
+        Releases the worker of the finished search and enables the controls again.
+        """
+
+        self.worker.deleteLater()
+        self.worker = None
+        self.setSearching(False)
+
+    def cancelSearch(self):
+        """
+        Cancels the current search.
+        """
+
+        if self.worker is not None:
+            self.worker.cancel()
@@ -0,0 +1,59 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from src.model.agents.Budget import Budget
+from src.model.agents.CancelToken import CancelToken
+
+
+class SearchWorker(QThread):
+    """
+    A thread for running a search off the Qt event loop.
+
+    The search is given a budget holding the worker's cancel token and reporting progress through
+    the progress signal. Signals are delivered to the event loop of the thread that owns the worker,
+    so slots connected by the controller run on the GUI thread.
+
+    Attributes:
+        search (callable): The search to run, called with a budget.
+        cancelToken (CancelToken): The token that cancels the search.
+
+    Methods:
+        __init__(self, search): Initializes the worker for a given search.
+        run(self): Runs the search in the worker thread.
+        cancel(self): Requests the cancellation of the search.
+    """
+
+    progress = pyqtSignal(int, float)
+    solved = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, search):
+        """
+        Initializes the worker for a given search.
+
+        :param search: The search to run, called with a budget and returning a search result.
+        """
+
+        super().__init__()
+
+        self.search = search
+        self.cancelToken = CancelToken()
+
+    def run(self):
+        """
+        Runs the search in the worker thread, emitting solved with its result or failed with its error.
+        """
+
+        budget = Budget(cancelToken=self.cancelToken, progress=self.progress.emit)
+        try:
+            result = self.search(budget)
+        except Exception as error:
+            self.failed.emit(repr(error))
+            return
+        self.solved.emit(result)
+
+    def cancel(self):
+        """
+        Requests the cancellation of the search.
+        """
+
+        self.cancelToken.cancel()
@@ -0,0 +1,108 @@
+class Animation:
+    """
+    A class for representing the playback of a solution as frames of cell changes.
+
+    The whole solution is precomputed into one frame per timestep, holding only the cells that
+    change from the previous timestep, so playing a timestep repaints just the cells agents moved
+    between. An agent stays on its goal once its path ends. A change is a (row, column, colour,
+    text) tuple, the arguments of Maze.changeCell.
+
+    Attributes:
+        paths (list): The (name, cells) of each agent, where cells are the (row, column) of each timestep.
+        colour (str): The colour of a cell holding an agent.
+        background (str): The colour of a cell without an agent.
+        length (int): The number of timesteps in the animation.
+        frames (list): The changes of each timestep, the first holding every agent's start.
+
+    Methods:
+        __init__(self, solution, colour, background): Precomputes the frames of a solution.
+        createFrames(self): Creates the changes of each timestep.
+        getFrame(self, step): Returns the changes from the previous timestep to a timestep.
+        getState(self, step): Returns the text of each cell holding an agent at a timestep.
+        seek(self, currentStep, step): Returns the changes from one timestep to any other.
+    """
+
+    def __init__(self, solution: dict, colour: str = "#BE100E", background: str = "white"):
+        """
+        Precomputes the frames of a solution.
+
+        :param solution: Dictionary of each agent's path, as returned by a search.
+        :param colour: The colour of a cell holding an agent.
+        :param background: The colour of a cell without an agent.
+        """
+
+        self.paths = [(agent.replace("agent", ""), [(position['x'], position['y']) for position in path])
+                      for agent, path in solution.items() if path]
+        self.colour = colour
+        self.background = background
+        self.length = max((len(cells) for _, cells in self.paths), default=0)
+        self.frames = self.createFrames()
+
+    def createFrames(self) -> list:
+        """
+        Creates the changes of each timestep, following only the agents still moving.
+
+        :return: List of the changes of each timestep.
+        """
+
+        occupancy = {}
+        for name, cells in self.paths:
+            occupancy[cells[0]] = name
+        frames = [[(x, y, self.colour, name) for (x, y), name in occupancy.items()]]
+
+        moving = [path for path in self.paths if len(path[1]) > 1]
+        for step in range(1, self.length):
+            moving = [path for path in moving if step < len(path[1])]
+            moves = [(name, cells[step - 1], cells[step]) for name, cells in moving if cells[step - 1] != cells[step]]
+
+            touched = set()
+            for name, previous, current in moves:
+                if occupancy.get(previous) == name:
+                    del occupancy[previous]
+                touched.add(previous)
+            for name, previous, current in moves:
+                occupancy[current] = name
+                touched.add(current)
+
+            frames.append([(x, y, self.colour, occupancy[(x, y)]) if (x, y) in occupancy
+                           else (x, y, self.background, "") for x, y in touched])
+
+        return frames
+
+    def getFrame(self, step: int) -> list:
+        """
+        Returns the changes from the previous timestep to a timestep.
+
+        :param step: The timestep of the frame.
+        :return: List of the changes to apply.
+        """
+
+        return self.frames[step]
+
+    def getState(self, step: int) -> dict:
+        """
+        Returns the text of each cell holding an agent at a timestep.
+
+        :param step: The timestep of the state.
+        :return: Dictionary of the agent name in each occupied (row, column) cell.
+        """
+
+        return {cells[min(step, len(cells) - 1)]: name for name, cells in self.paths}
+
+    def seek(self, currentStep, step: int) -> list:
+        """
+        Returns the changes from one timestep to any other, so playback can jump forwards or backwards.
+
+        :param currentStep: The timestep currently displayed, None if no timestep is displayed.
+        :param step: The timestep to display.
+        :return: List of the changes to apply.
+        """
+
+        if currentStep is not None and step == currentStep + 1:
+            return self.frames[step]
+
+        current = self.getState(currentStep) if currentStep is not None else {}
+        target = self.getState(step)
+        changes = [(x, y, self.background, "") for x, y in current.keys() - target.keys()]
+        changes.extend((x, y, self.colour, name) for (x, y), name in target.items() if current.get((x, y)) != name)
+        return changes
@@ -0,0 +1,87 @@
+import json
+import multiprocessing
+from functools import partial
+
+from src.model.Solver import Solver
+
+
+class Batch:
+    """
+    A class for solving many multi-agent pathfinding instances across a pool of worker processes.
+
+    An instance is a dictionary describing a maze and its agents:
+
+        {"id": "example", "width": 8, "height": 8, "obstacles": [[0, 1], [2, 3]],
+         "agents": {"agent1": {"start": [0, 0], "goal": [7, 7]}},
+         "solver": {"suboptimality": 1.5, "prioritiseConflicts": true}}
+
+    Obstacles, starts and goals are (row, column) pairs, and each instance is solved by a Solver,
+    which describes the search and solver options. Results are yielded as soon as each instance
+    finishes, so they are not in the order of the instances; every result carries the id of its
+    instance. An instance stopped by its budget reports the status of its SearchResult along with
+    its best partial paths.
+
+    Attributes:
+        workers (int): The number of worker processes.
+        timeLimit (float): The time limit of each instance in seconds, None for no limit.
+        expansionLimit (int): The number of constraint tree nodes each instance may expand, None for no limit.
+
+    Methods:
+        __init__(self, workers, timeLimit, expansionLimit): Initializes the batch runner.
+        run(self, instances): Solves instances across the worker processes, yielding each result.
+        loadInstances(file): Reads instances from a JSON list or a file of JSON lines.
+        solveInstance(instance, timeLimit, expansionLimit): Solves a single instance within a budget.
+    """
+
+    def __init__(self, workers=None, timeLimit=None, expansionLimit=None):
+        """
+        Initializes the batch runner.
+
+        :param workers: The number of worker processes, the number of CPUs if None.
+        :param timeLimit: The time limit of each instance in seconds, None for no limit.
+        :param expansionLimit: The number of constraint tree nodes each instance may expand, None for no limit.
+        """
+
+        self.workers = workers if workers is not None else multiprocessing.cpu_count()
+        self.timeLimit = timeLimit
+        self.expansionLimit = expansionLimit
+
+    def run(self, instances):
+        """
+        Solves instances across the worker processes, yielding each result as it finishes.
+
+        :param instances: The instances to solve.
+        :return: A generator of result dictionaries, in order of completion.
+        """
+
+        solve = partial(Batch.solveInstance, timeLimit=self.timeLimit, expansionLimit=self.expansionLimit)
+        with multiprocessing.Pool(self.workers) as pool:
+            for result in pool.imap_unordered(solve, instances, chunksize=1):
+                yield result
+
+    @staticmethod
+    def loadInstances(file):
+        """
+        Reads instances from a JSON list or a file of JSON lines.
+
+        :param file: The open file to read.
+        :return: List of instance dictionaries.
+        """
+
+        text = file.read()
+        if text.lstrip().startswith("["):
+            return json.loads(text)
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    @staticmethod
+    def solveInstance(instance, timeLimit=None, expansionLimit=None):
+        """
+        Solves a single instance within a budget.
+
+        :param instance: The instance to solve.
+        :param timeLimit: The time limit in seconds, None for no limit.
+        :param expansionLimit: The number of constraint tree nodes the search may expand, None for no limit.
+        :return: Dictionary of the id, status, cost, lower bound, time, search statistics and paths of the instance.
+        """
+
+        return Solver(timeLimit, expansionLimit).solveInstance(instance)
@@ -1,9 +1,8 @@
 from src.model.graph.Graph import Graph
+from src.model.agents.Budget import Budget
 from src.model.agents.SingleAgent import SingleAgent
 from src.model.agents.cbs.CBS import *
 
-import time
-
 
 class Model:
     """
@@ -12,15 +11,18 @@ class Model:
     Attributes:
         maze (Graph): The graph representing a maze.
         singleAgent (SingleAgent): The single-agent that will traverse the maze.
-        multiAgent (CBS): The multi-agent that will traverse the maze.
+        multiAgent (CBS): The multi-agent that will traverse the maze, an ECBS instance for bounded-suboptimal search.
         currentSolution (dict): The current path found by a single-agent search.
+        currentResult (SearchResult): The result of the last search, with its status and lower bound.
 
     Methods:
         __init__(self): Initializes the model object.
         setMaze(self, width, height): Sets a new maze to a given width and height.
         setObstacle(self, node): Toggles a given node as an obstacle in the maze.
-        setSingleAgentPath(self, search, start, goal): Sets the current path to a given search result.
-        setMultiAgentPath(self, waypoints): Sets the current path to given waypoints.
+        setSingleAgentPath(self, search, start, goal, budget): Sets the current path to a given search result.
+        setMultiAgentSearch(self, suboptimality, prioritiseConflicts, bypassConflicts, disjointSplitting): Sets the
+            multi-agent search.
+        setMultiAgentPath(self, waypoints, suboptimality, budget): Sets the current path to given waypoints.
     """
 
     def __init__(self):
@@ -36,6 +38,8 @@ class Model:
 
         self.currentSolution = {}
 
+        self.currentResult = None
+
         self.setMaze(4, 4)
 
     def setMaze(self, width: int, height: int):
@@ -55,50 +59,61 @@ class Model:
         :param node: The node to be toggled.
         """
 
-        self.maze.nodes[node].obstacle = not self.maze.nodes[node].obstacle
+        self.maze.toggleObstacle(node)
 
-    def setSingleAgentPath(self, search: int, start: int, goal: int):
+    def setSingleAgentPath(self, search: int, start: int, goal: int, budget: Budget = None):
         """
         Sets the current single agent path to a given search result.
 
         :param search: The search to be used for the path.
         :param start: The starting node of the agent.
         :param goal: The goal node of the agent.
+        :param budget: The time and expansions the search may spend, None for no limit.
+        :return: The result of the search, None if the search type is unknown.
+        """
+
+        if search not in (0, 1, 2):
+            return None
+
+        self.currentResult = self.singleAgent.solve(self.maze, search, start, goal, budget)
+        self.currentSolution = self.currentResult.solution
+        return self.currentResult
+
+    def setMultiAgentSearch(self, suboptimality: float = 1, prioritiseConflicts: bool = False,
+                            bypassConflicts: bool = False, disjointSplitting: bool = False):
         """
+        Sets the multi-agent search.
 
-        self.maze.reset()
-
-        if search == 0:
-            startTime = time.time()
-            self.currentSolution = self.singleAgent.DFS(self.maze, start, goal)
-            endTime = time.time()
-            print("DFS Time: " + str(endTime - startTime))
-        elif search == 1:
-            startTime = time.time()
-            self.currentSolution = self.singleAgent.BFS(self.maze, start, goal)
-            endTime = time.time()
-            print("BFS Time: " + str(endTime - startTime))
-        elif search == 2:
-            startTime = time.time()
-            self.currentSolution = self.singleAgent.AStar(self.maze, start, goal)
-            endTime = time.time()
-            print("AStar Time " + str(endTime - startTime))
-
-    def setMultiAgentPath(self, waypoints: dict):
+        :param suboptimality: The factor the cost of a solution may exceed the optimal cost by, 1 for optimal CBS.
+        :param prioritiseConflicts: Whether to split on cardinal conflicts first.
+        :param bypassConflicts: Whether to adopt a child's path into its parent instead of branching.
+        :param disjointSplitting: Whether to split conflicts into a negative and a positive constraint.
+        """
+
+        if suboptimality > 1:
+            # Imported here so callers of optimal CBS, such as the headless solver, do not load ECBS at start-up.
+            from src.model.agents.cbs.ECBS import ECBS
+            self.multiAgent = ECBS(suboptimality, prioritiseConflicts, bypassConflicts, disjointSplitting)
+        else:
+            self.multiAgent = CBS(prioritiseConflicts, bypassConflicts, disjointSplitting)
+
+    def setMultiAgentPath(self, waypoints: dict, suboptimality: float = None, budget: Budget = None):
         """
         Sets the current multi-agent path to given waypoints.
 
+        If the budget runs out, the current path is the best partial solution, which may still
+        contain conflicts.
+
         :param waypoints: The waypoints to be used for the path.
-        :return: The current multi-agent path to given waypoints.
+        :param suboptimality: The suboptimality factor to search with, None to keep the current multi-agent search.
+        :param budget: The time and constraint tree expansions the search may spend, None for no limit.
+        :return: The result of the search, holding the current multi-agent path to given waypoints.
         """
 
-        self.maze.reset()
+        if suboptimality is not None and suboptimality != self.multiAgent.suboptimality:
+            self.setMultiAgentSearch(suboptimality, self.multiAgent.prioritiseConflicts,
+                                     self.multiAgent.bypassConflicts, self.multiAgent.disjointSplitting)
 
-        startTime = time.time()
-        solution = self.multiAgent.search(self.maze, waypoints)
-        endTime = time.time()
-        print("CBS Time: " + str(endTime - startTime))
-        if solution is not None:
-            self.currentSolution = solution
-        else:
-            self.currentSolution = {}
+        self.currentResult = self.multiAgent.solve(self.maze, waypoints, budget)
+        self.currentSolution = self.currentResult.solution
+        return self.currentResult
@@ -0,0 +1,233 @@
+import time
+
+from src.model.Model import Model
+from src.model.agents.Budget import Budget
+from src.model.agents.cbs.CBSUtils import State, Location
+from src.model.graph.Graph import Graph
+from src.model.graph.MovingAI import MovingAI
+
+
+class Solver:
+    """
+    A class for solving pathfinding instances without the user interface.
+
+    Nothing here imports PyQt5, so it can run on machines without a display. An instance is a
+    dictionary describing a maze and its agents, in the format read by Batch:
+
+        {"id": "example", "width": 8, "height": 8, "obstacles": [[0, 1], [2, 3]],
+         "agents": {"agent1": {"start": [0, 0], "goal": [7, 7]}},
+         "search": "cbs", "solver": {"suboptimality": 1.5, "prioritiseConflicts": true}}
+
+    Obstacles, starts and goals are (row, column) pairs. Instead of its width, height and
+    obstacles, an instance may give the path of a MovingAI .map file as "map", and instead of its
+    agents, the path of a .scen file as "scenario", taking the first "agentCount" problems of the
+    scenario's "buckets" (every problem and bucket by default). The search is "cbs" for a
+    multi-agent search configured by the solver options of Model.setMultiAgentSearch, or "dfs",
+    "bfs" or "astar" for a single-agent search of the only agent. The searches are called directly
+    rather than through the Model's set methods, so no current path is kept between instances.
+
+    Attributes:
+        timeLimit (float): The time limit of each search in seconds, None for no limit.
+        expansionLimit (int): The number of nodes each search may expand, None for no limit.
+
+    Methods:
+        __init__(self, timeLimit, expansionLimit): Initializes the solver.
+        checkCell(width, height, cell, name): Checks that a cell lies inside a maze.
+        createGraph(self, width, height, obstacles): Creates a maze from a list of obstacles.
+        loadGraph(self, instance): Creates the maze of an instance.
+        loadAgents(self, instance): Returns the agents of an instance.
+        createModel(self, graph): Creates a model holding a maze.
+        solveSingleAgent(self, graph, start, goal, search, agent): Solves a single-agent search.
+        solveMultiAgent(self, graph, agents, **options): Solves a multi-agent search.
+        solveInstance(self, instance): Solves an instance, reporting any error in its result.
+        createResult(self, searchResult, statistics, startTime): Converts a search result to a dictionary.
+    """
+
+    SEARCHES = {"dfs": 0, "bfs": 1, "astar": 2}
+
+    def __init__(self, timeLimit: float = None, expansionLimit: int = None):
+        """
+        Initializes the solver.
+
+        :param timeLimit: The time limit of each search in seconds, None for no limit.
+        :param expansionLimit: The number of nodes each search may expand, None for no limit.
+        """
+
+        self.timeLimit = timeLimit
+        self.expansionLimit = expansionLimit
+
+    @staticmethod
+    def checkCell(width: int, height: int, cell, name: str):
+        """
+        Checks that a cell lies inside a maze.
+
+        :param width: The width of the maze.
+        :param height: The height of the maze.
+        :param cell: The (row, column) of the cell.
+        :param name: The name of the cell in the error message.
+        :raises ValueError: If the cell lies outside the maze.
+        """
+
+        row, column = cell
+        if not (0 <= row < height and 0 <= column < width):
+            raise ValueError(f"{name} {[row, column]} is outside the {height}x{width} maze")
+
+    def createGraph(self, width: int, height: int, obstacles) -> Graph:
+        """
+        Creates a maze from a list of obstacles.
+
+        :param width: The width of the maze.
+        :param height: The height of the maze.
+        :param obstacles: Iterable of the (row, column) of each obstacle.
+        :raises ValueError: If an obstacle lies outside the maze.
+        :return: The graph/maze.
+        """
+
+        occupancy = bytearray(width * height)
+        for row, column in obstacles:
+            self.checkCell(width, height, (row, column), "obstacle")
+            occupancy[row * width + column] = 1
+
+        graph = Graph()
+        graph.create(width, height)
+        graph.setObstacles(occupancy)
+        return graph
+
+    def loadGraph(self, instance: dict) -> Graph:
+        """
+        Creates the maze of an instance, from its MovingAI map file if it has one.
+
+        :param instance: The instance.
+        :return: The graph/maze.
+        """
+
+        if "map" in instance:
+            with open(instance["map"], 'r') as file:
+                return MovingAI.loadMap(file)
+        return self.createGraph(instance["width"], instance["height"], instance.get("obstacles", []))
+
+    def loadAgents(self, instance: dict) -> dict:
+        """
+        Returns the agents of an instance, from its MovingAI scenario file if it has one.
+
+        :param instance: The instance.
+        :return: Dictionary of each agent's {"start": (row, column), "goal": (row, column)}.
+        """
+
+        if "scenario" in instance:
+            with open(instance["scenario"], 'r') as file:
+                problems = MovingAI.loadScenario(file)
+            return MovingAI.getAgents(problems, instance.get("agentCount"), instance.get("buckets"))
+        return instance["agents"]
+
+    def createModel(self, graph: Graph) -> Model:
+        """
+        Creates a model holding a maze.
+
+        :param graph: The graph/maze.
+        :return: The model.
+        """
+
+        model = Model()
+        model.maze = graph
+        return model
+
+    def solveSingleAgent(self, graph: Graph, start, goal, search: str = "astar", agent: str = "agent0") -> dict:
+        """
+        Solves a single-agent search.
+
+        :param graph: The graph/maze to search.
+        :param start: The (row, column) of the start.
+        :param goal: The (row, column) of the goal.
+        :param search: The search to use, "dfs", "bfs" or "astar".
+        :param agent: The name of the agent in the paths of the result.
+        :raises ValueError: If the search is unknown or the start or goal lies outside the maze.
+        :return: Dictionary of the status, cost, lower bound, time, search statistics and path of the search.
+        """
+
+        if search not in self.SEARCHES:
+            raise ValueError(f"unknown single-agent search {search!r}")
+        self.checkCell(graph.width, graph.height, start, f"start of {agent}")
+        self.checkCell(graph.width, graph.height, goal, f"goal of {agent}")
+
+        model = self.createModel(graph)
+        startTime = time.perf_counter()
+        searchResult = model.singleAgent.solve(graph, self.SEARCHES[search], start[0] * graph.width + start[1],
+                                               goal[0] * graph.width + goal[1],
+                                               Budget(self.timeLimit, self.expansionLimit))
+        result = self.createResult(searchResult, searchResult.statistics, startTime)
+        if result["paths"]:
+            result["paths"] = {agent: result["paths"]["agent0"]}
+        return result
+
+    def solveMultiAgent(self, graph: Graph, agents: dict, **options) -> dict:
+        """
+        Solves a multi-agent search.
+
+        :param graph: The graph/maze to search.
+        :param agents: Dictionary of each agent's {"start": (row, column), "goal": (row, column)}.
+        :param options: The options of Model.setMultiAgentSearch.
+        :raises ValueError: If the start or goal of an agent lies outside the maze.
+        :return: Dictionary of the status, cost, lower bound, time, search statistics and paths of the search.
+        """
+
+        for agent, points in agents.items():
+            self.checkCell(graph.width, graph.height, points["start"], f"start of {agent}")
+            self.checkCell(graph.width, graph.height, points["goal"], f"goal of {agent}")
+
+        model = self.createModel(graph)
+        model.setMultiAgentSearch(**options)
+        waypoints = {agent: {"start": State(0, Location(*points["start"])),
+                             "goal": State(0, Location(*points["goal"]))}
+                     for agent, points in agents.items()}
+
+        startTime = time.perf_counter()
+        searchResult = model.multiAgent.solve(graph, waypoints, Budget(self.timeLimit, self.expansionLimit))
+        return self.createResult(searchResult, model.multiAgent.statistics, startTime)
+
+    def solveInstance(self, instance: dict) -> dict:
+        """
+        Solves an instance, reporting any error in its result instead of raising it.
+
+        :param instance: The instance to solve.
+        :return: Dictionary of the id, status, cost, lower bound, time, search statistics and paths of the instance.
+        """
+
+        result = {"id": instance.get("id"), "status": None, "cost": None, "lowerBound": None, "time": None,
+                  "statistics": None, "paths": None}
+
+        startTime = time.perf_counter()
+        try:
+            graph = self.loadGraph(instance)
+            agents = self.loadAgents(instance)
+            search = instance.get("search", "cbs")
+            if search == "cbs":
+                result.update(self.solveMultiAgent(graph, agents, **instance.get("solver", {})))
+            else:
+                if len(agents) != 1:
+                    raise ValueError(f"single-agent search {search!r} needs exactly one agent")
+                (agent, points), = agents.items()
+                result.update(self.solveSingleAgent(graph, points["start"], points["goal"], search, agent))
+        except Exception as error:
+            result["status"] = "error"
+            result["error"] = repr(error)
+            result["time"] = time.perf_counter() - startTime
+
+        return result
+
+    def createResult(self, searchResult, statistics: dict, startTime: float) -> dict:
+        """
+        Converts a search result to a dictionary that can be written as JSON.
+
+        :param searchResult: The result of the search.
+        :param statistics: The statistics of the search.
+        :param startTime: The time the search started, from time.perf_counter.
+        :return: Dictionary of the status, cost, lower bound, time, search statistics and paths of the search.
+        """
+
+        paths = None
+        if searchResult.solution:
+            paths = {agent: [[state['x'], state['y']] for state in path]
+                     for agent, path in searchResult.solution.items()}
+        return {"status": searchResult.status, "cost": searchResult.cost, "lowerBound": searchResult.lowerBound,
+                "time": time.perf_counter() - startTime, "statistics": dict(statistics), "paths": paths}
@@ -0,0 +1,116 @@
+import time
+
+from src.model.agents.SearchResult import SearchResult
+
+
+class Budget:
+    """
+    A class for representing the wall-clock time and expansions a search may spend.
+
+    Searches call spend once per expansion, and stop with the returned status as soon as it is not
+    None. Searches nested inside an expansion, such as the low-level searches of CBS, call poll
+    every few hundred of their own expansions, so the time limit, cancellation and progress reports
+    are honoured while they run without them counting towards the expansion limit. A budget is
+    started by the search that uses it, so it can be reused across searches. A progress callback is
+    called with the expansions and elapsed seconds at most once per interval, from the thread
+    running the search.
+
+    Attributes:
+        timeLimit (float): The number of seconds the search may run for, None for no limit.
+        expansionLimit (int): The number of expansions the search may make, None for no limit.
+        cancelToken (CancelToken): The token that cancels the search, None if it cannot be cancelled.
+        progress (callable): Called with the expansions and elapsed seconds as the search runs, None for no reports.
+        progressInterval (float): The minimum number of seconds between progress reports.
+        startTime (float): The time the budget was started at.
+        deadline (float): The time the search must stop at, None for no limit.
+        expansions (int): The number of expansions spent since the budget was started.
+        nextReport (float): The earliest time of the next progress report.
+
+    Methods:
+        __init__(self, timeLimit, expansionLimit, cancelToken, progress, progressInterval): Initializes the budget.
+        start(self): Starts the budget for a new search.
+        spend(self, expansions): Spends expansions and checks if the search must stop.
+        poll(self): Reports progress and checks if the search must stop, without spending expansions.
+        check(self): Checks if the search must stop.
+        getElapsed(self): Returns the number of seconds since the budget was started.
+    """
+
+    __slots__ = ("timeLimit", "expansionLimit", "cancelToken", "progress", "progressInterval", "startTime", "deadline",
+                 "expansions", "nextReport")
+
+    def __init__(self, timeLimit=None, expansionLimit=None, cancelToken=None, progress=None, progressInterval=0.1):
+        """
+        Initializes the budget.
+
+        :param timeLimit: The number of seconds the search may run for, None for no limit.
+        :param expansionLimit: The number of expansions the search may make, None for no limit.
+        :param cancelToken: The token that cancels the search, None if it cannot be cancelled.
+        :param progress: Called with the expansions and elapsed seconds as the search runs, None for no reports.
+        :param progressInterval: The minimum number of seconds between progress reports.
+        """
+
+        self.timeLimit = timeLimit
+        self.expansionLimit = expansionLimit
+        self.cancelToken = cancelToken
+        self.progress = progress
+        self.progressInterval = progressInterval
+        self.start()
+
+    def start(self):
+        """
+        Starts the budget for a new search.
+        """
+
+        self.startTime = time.perf_counter()
+        self.deadline = self.startTime + self.timeLimit if self.timeLimit is not None else None
+        self.expansions = 0
+        self.nextReport = self.startTime + self.progressInterval
+
+    def spend(self, expansions=1):
+        """
+        Spends expansions and checks if the search must stop.
+
+        :param expansions: The number of expansions to spend.
+        :return: The status the search stops with, None if it may continue.
+        """
+
+        self.expansions += expansions
+        return self.poll()
+
+    def poll(self):
+        """
+        Reports progress if a report is due and checks if the search must stop, without spending expansions.
+
+        :return: The status the search stops with, None if it may continue.
+        """
+
+        if self.progress is not None:
+            now = time.perf_counter()
+            if now >= self.nextReport:
+                self.nextReport = now + self.progressInterval
+                self.progress(self.expansions, now - self.startTime)
+        return self.check()
+
+    def check(self):
+        """
+        Checks if the search must stop.
+
+        :return: The status the search stops with, None if it may continue.
+        """
+
+        if self.cancelToken is not None and self.cancelToken.isCancelled():
+            return SearchResult.CANCELLED
+        if self.expansionLimit is not None and self.expansions > self.expansionLimit:
+            return SearchResult.EXPANSION_LIMIT
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            return SearchResult.TIME_LIMIT
+        return None
+
+    def getElapsed(self) -> float:
+        """
+        Returns the number of seconds since the budget was started.
+
+        :return: The number of seconds since the budget was started.
+        """
+
+        return time.perf_counter() - self.startTime
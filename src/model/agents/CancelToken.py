@@ -0,0 +1,43 @@
+import threading
+
+
+class CancelToken:
+    """
+    A class for representing a request to cancel a running search.
+
+    The token can be cancelled from any thread, and searches holding it in their budget stop at
+    their next check.
+
+    Attributes:
+        event (threading.Event): The event set when the token is cancelled.
+
+    Methods:
+        __init__(self): Initializes a token that has not been cancelled.
+        cancel(self): Requests the cancellation of every search holding the token.
+        isCancelled(self): Checks if the token has been cancelled.
+    """
+
+    __slots__ = ("event",)
+
+    def __init__(self):
+        """
+        Initializes a token that has not been cancelled.
+        """
+
+        self.event = threading.Event()
+
+    def cancel(self):
+        """
+        Requests the cancellation of every search holding the token.
+        """
+
+        self.event.set()
+
+    def isCancelled(self) -> bool:
+        """
+        Checks if the token has been cancelled.
+
+        :return: Boolean value indicating if the token has been cancelled.
+        """
+
+        return self.event.is_set()
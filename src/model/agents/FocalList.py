@@ -0,0 +1,111 @@
+import heapq
+from itertools import count
+
+
+class FocalList:
+    """
+    A class for representing the open and focal lists of a bounded-suboptimal focal search.
+
+    Every item has a lower bound, a cost and a focal priority. The open list orders items by lower
+    bound, and the focal list holds the items whose cost is within the suboptimality factor of the
+    lowest lower bound, ordered by focal priority. Items above the bound wait in a pending heap
+    ordered by cost, and move into the focal list as the lowest lower bound rises. Popped items are
+    left in the open list and skipped once they reach the top. The cost of an item must be within
+    the suboptimality factor of its own lower bound, so the focal list is never empty while items
+    are queued.
+
+    With a suboptimality factor of 1 and costs equal to lower bounds, items are popped in order of
+    cost and then focal priority.
+
+    Attributes:
+        suboptimality (float): The factor the cost of a focal item may exceed the lowest lower bound by.
+        open (list): Heap of (lower bound, id, item) entries, possibly including popped entries.
+        pending (list): Heap of (cost, id, priority, item) entries not yet in the focal list.
+        focal (list): Heap of (priority, id, cost, item) entries within the bound.
+        removed (set): The ids of the popped items.
+        counter (count): The source of item ids, which keep equal entries in insertion order.
+
+    Methods:
+        __init__(self, suboptimality): Initializes an empty focal list.
+        __len__(self): Returns the number of queued items.
+        push(self, item, lowerBound, cost, priority): Queues an item.
+        pop(self): Removes and returns the focal item with the lowest priority.
+        getLowerBound(self): Returns the lowest lower bound of the queued items.
+    """
+
+    __slots__ = ("suboptimality", "open", "pending", "focal", "removed", "counter")
+
+    def __init__(self, suboptimality=1):
+        """
+        Initializes an empty focal list.
+
+        :param suboptimality: The factor the cost of a focal item may exceed the lowest lower bound by.
+        """
+
+        self.suboptimality = suboptimality
+        self.open = []
+        self.pending = []
+        self.focal = []
+        self.removed = set()
+        self.counter = count()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of queued items.
+
+        :return: The number of queued items.
+        """
+
+        return len(self.pending) + len(self.focal)
+
+    def push(self, item, lowerBound, cost, priority):
+        """
+        Queues an item.
+
+        :param item: The item to queue.
+        :param lowerBound: The lower bound of the item, used to order the open list.
+        :param cost: The cost of the item, compared against the bound of the focal list.
+        :param priority: The priority of the item in the focal list, lower priorities are popped first.
+        """
+
+        itemId = next(self.counter)
+        heapq.heappush(self.open, (lowerBound, itemId, item))
+        heapq.heappush(self.pending, (cost, itemId, priority, item))
+
+    def pop(self):
+        """
+        Removes and returns the focal item with the lowest priority.
+
+        :return: The item with the lowest priority whose cost is within the bound.
+        """
+
+        bound = self.suboptimality * self.getLowerBound()
+
+        pending = self.pending
+        focal = self.focal
+        while pending and pending[0][0] <= bound:
+            cost, itemId, priority, item = heapq.heappop(pending)
+            heapq.heappush(focal, (priority, itemId, cost, item))
+
+        while True:
+            priority, itemId, cost, item = heapq.heappop(focal)
+            if cost > bound:
+                heapq.heappush(pending, (cost, itemId, priority, item))
+                continue
+            self.removed.add(itemId)
+            return item
+
+    def getLowerBound(self):
+        """
+        Returns the lowest lower bound of the queued items.
+
+        :return: The lowest lower bound in the open list.
+        """
+
+        heap = self.open
+        removed = self.removed
+        while heap and heap[0][1] in removed:
+            removed.discard(heapq.heappop(heap)[1])
+        if not heap:
+            raise IndexError("pop from an empty focal list")
+        return heap[0][0]
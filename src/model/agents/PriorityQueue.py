@@ -0,0 +1,109 @@
+import heapq
+
+
+class PriorityQueue:
+    """
+    A class for representing an indexed priority queue with decrease-key.
+
+    Items are kept in a binary heap alongside an index of the best priority of each queued item.
+    Lowering the priority of a queued item pushes a new entry and leaves the old one in the heap,
+    where it is recognised as stale and skipped when it reaches the top.
+
+    Attributes:
+        heap (list): Heap of (priority, item) entries, possibly including stale entries.
+        index (dict): The current priority of each queued item.
+
+    Methods:
+        __init__(self): Initializes an empty priority queue.
+        __len__(self): Returns the number of queued items.
+        __contains__(self, item): Checks if an item is queued.
+        push(self, item, priority): Queues an item, or lowers the priority of a queued item.
+        pop(self): Removes and returns the item with the lowest priority.
+        peek(self): Returns the lowest priority in the queue without removing it.
+        getPriority(self, item): Returns the current priority of a queued item.
+    """
+
+    __slots__ = ("heap", "index")
+
+    def __init__(self):
+        """
+        Initializes an empty priority queue.
+        """
+
+        self.heap = []
+        self.index = {}
+
+    def __len__(self) -> int:
+        """
+        Returns the number of queued items.
+
+        :return: The number of queued items.
+        """
+
+        return len(self.index)
+
+    def __contains__(self, item) -> bool:
+        """
+        Checks if an item is queued.
+
+        :param item: The item to check.
+        :return: Boolean value indicating if the item is queued.
+        """
+
+        return item in self.index
+
+    def push(self, item, priority) -> bool:
+        """
+        Queues an item, or lowers the priority of a queued item.
+
+        :param item: The item to queue.
+        :param priority: The priority of the item, lower priorities are popped first.
+        :return: Boolean value indicating if the queue was changed.
+        """
+
+        current = self.index.get(item)
+        if current is not None and current <= priority:
+            return False
+        self.index[item] = priority
+        heapq.heappush(self.heap, (priority, item))
+        return True
+
+    def pop(self):
+        """
+        Removes and returns the item with the lowest priority.
+
+        :return: The item with the lowest priority.
+        """
+
+        heap = self.heap
+        index = self.index
+        while heap:
+            priority, item = heapq.heappop(heap)
+            if index.get(item) == priority:
+                del index[item]
+                return item
+        raise IndexError("pop from an empty priority queue")
+
+    def peek(self):
+        """
+        Returns the lowest priority in the queue without removing it.
+
+        :return: The lowest priority in the queue.
+        """
+
+        heap = self.heap
+        while heap and self.index.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        if not heap:
+            raise IndexError("peek from an empty priority queue")
+        return heap[0][0]
+
+    def getPriority(self, item):
+        """
+        Returns the current priority of a queued item.
+
+        :param item: The queued item.
+        :return: The priority of the item, or None if it is not queued.
+        """
+
+        return self.index.get(item)
@@ -0,0 +1,67 @@
+class SearchResult:
+    """
+    A class for representing the outcome of a search.
+
+    A search that is stopped by its budget returns its best partial solution: the path towards the
+    node closest to the goal for a single agent, or the solution with the fewest conflicts for
+    multiple agents. The lower bound is a bound on the cost of an optimal solution, so a solved
+    result costs at most its suboptimality factor times it.
+
+    Attributes:
+        status (str): Why the search stopped, one of the status constants.
+        solution (dict): The solution, the best partial solution if the search was stopped, empty if none.
+        cost (int): The total number of states in the solution, None if there is none.
+        lowerBound (int): The lower bound on the cost of an optimal solution, None if unknown.
+        statistics (dict): The search statistics, such as the number of nodes expanded.
+        time (float): The number of seconds the search ran for.
+
+    Methods:
+        __init__(self, status, solution, lowerBound, statistics, time): Initializes the result.
+        isSolved(self): Checks if the search found a complete solution.
+        toDict(self): Returns the result as a dictionary of plain values.
+    """
+
+    SOLVED = "solved"
+    UNSOLVABLE = "unsolvable"
+    TIME_LIMIT = "time limit"
+    EXPANSION_LIMIT = "expansion limit"
+    CANCELLED = "cancelled"
+
+    __slots__ = ("status", "solution", "cost", "lowerBound", "statistics", "time")
+
+    def __init__(self, status, solution=None, lowerBound=None, statistics=None, time=0.0):
+        """
+        Initializes the result.
+
+        :param status: Why the search stopped, one of the status constants.
+        :param solution: The solution or best partial solution, in the solution format used by the model.
+        :param lowerBound: The lower bound on the cost of an optimal solution, None if unknown.
+        :param statistics: The search statistics.
+        :param time: The number of seconds the search ran for.
+        """
+
+        self.status = status
+        self.solution = solution if solution is not None else {}
+        self.cost = sum([len(path) for path in self.solution.values()]) if self.solution else None
+        self.lowerBound = lowerBound
+        self.statistics = dict(statistics) if statistics is not None else {}
+        self.time = time
+
+    def isSolved(self) -> bool:
+        """
+        Checks if the search found a complete solution.
+
+        :return: Boolean value indicating if the solution is complete.
+        """
+
+        return self.status == SearchResult.SOLVED
+
+    def toDict(self) -> dict:
+        """
+        Returns the result as a dictionary of plain values.
+
+        :return: Dictionary of the status, solution, cost, lower bound, statistics and time.
+        """
+
+        return {"status": self.status, "solution": self.solution, "cost": self.cost, "lowerBound": self.lowerBound,
+                "statistics": self.statistics, "time": self.time}
@@ -0,0 +1,23 @@
+class SearchStopped(Exception):
+    """
+    An exception raised by a search nested inside another when the budget they share runs out.
+
+    The low-level searches of CBS raise it so that the high-level search can stop from any depth
+    of planning and return its best partial result.
+
+    Attributes:
+        status (str): The status the search stopped with, one of the SearchResult statuses.
+
+    Methods:
+        __init__(self, status): Initializes the exception.
+    """
+
+    def __init__(self, status: str):
+        """
+        Initializes the exception.
+
+        :param status: The status the search stopped with.
+        """
+
+        super().__init__(status)
+        self.status = status
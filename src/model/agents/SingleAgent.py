@@ -1,20 +1,43 @@
-import heapq
+import time
 from collections import deque
 
-from src.model.graph.Node import Node
+from src.model.agents.Budget import Budget
+from src.model.agents.PriorityQueue import PriorityQueue
+from src.model.agents.SearchResult import SearchResult
 from src.model.graph.Graph import Graph
+from src.model.graph.SearchState import SearchState
 
 
 class SingleAgent:
     """
     A class for representing a single agent.
 
+    Each search has a budgeted form (solveDFS, solveBFS, solveAStar) that returns a SearchResult and
+    stops as soon as its budget runs out, and a plain form (DFS, BFS, AStar) that runs to completion
+    and returns the path.
+
+    Every search keeps its statistics and search state to itself, and returns its statistics in its
+    result, so several threads can search with one single-agent object at the same time. Search
+    states are taken from and returned to a shared pool with single list operations, which are
+    atomic, so no two searches are given the same state.
+
+    Attributes:
+        states (list): Pool of search states that are free to be reused.
+
     Methods:
         __init__(self): Initializes the single-agent object.
         DFS(self, graph, start, goal): Performs the DFS on a given graph/maze.
         BFS(self, graph, start, goal): Performs the BFS on a given graph/maze.
         AStar(self, graph, start, goal): Performs the A* search on a given graph/maze.
-        createPath(self, node): Creates a path from the given node to its origin.
+        solve(self, graph, search, start, goal, budget): Performs a given search within a budget.
+        solveDFS(self, graph, start, goal, budget): Performs the DFS within a budget.
+        solveBFS(self, graph, start, goal, budget): Performs the BFS within a budget.
+        solveAStar(self, graph, start, goal, budget): Performs the A* search within a budget.
+        stopSearch(self, graph, state, goal, status, lowerBound, statistics, startTime): Creates the result of a
+            stopped search.
+        acquireState(self, graph): Takes a reset search state for a given graph/maze from the pool.
+        releaseState(self, state): Returns a search state to the pool.
+        createPath(self, graph, state, node): Creates a path from the given node to its origin.
     """
 
     def __init__(self):
@@ -22,7 +45,7 @@ class SingleAgent:
         Initializes the single-agent object.
         """
 
-        pass
+        self.states = []
 
     def DFS(self, graph: Graph, start: int, goal: int) -> dict:
         """
@@ -34,28 +57,23 @@ class SingleAgent:
         :return: The resulting path (if one has been found).
         """
 
-        stack = [graph.nodes[start]]
-        graph.nodes[start].visited = True
+        return self.solveDFS(graph, start, goal).solution
 
-        while stack:
-            currentNode = stack.pop()
-
-            if currentNode == graph.nodes[goal]:
-                path = self.createPath(currentNode)
-                return path
+    def BFS(self, graph: Graph, start: int, goal: int) -> dict:
+        """
+        Performs the BFS on a given graph/maze.
 
-            for index in currentNode.neighbours:
-                neighbour = graph.nodes[index]
-                if not neighbour.visited and not neighbour.obstacle:
-                    neighbour.parent = currentNode
-                    stack.append(neighbour)
-                    neighbour.visited = True
+        :param graph: The graph/maze the agent will traverse.
+        :param start: The starting node for the search.
+        :param goal: The goal node for the search.
+        :return: The resulting path (if one has been found).
+        """
 
-        return {}
+        return self.solveBFS(graph, start, goal).solution
 
-    def BFS(self, graph: Graph, start: int, goal: int) -> dict:
+    def AStar(self, graph: Graph, start: int, goal: int) -> dict:
         """
-        Performs the BFS on a given graph/maze.
+        Performs the A* search on a given graph/maze.
 
         :param graph: The graph/maze the agent will traverse.
         :param start: The starting node for the search.
@@ -63,80 +81,236 @@ class SingleAgent:
         :return: The resulting path (if one has been found).
         """
 
-        queue = deque()
-        queue.append(graph.nodes[start])
-        graph.nodes[start].visited = True
+        return self.solveAStar(graph, start, goal).solution
 
-        while queue:
-            currentNode = queue.popleft()
+    def solve(self, graph: Graph, search: int, start: int, goal: int, budget: Budget = None) -> SearchResult:
+        """
+        Performs a given search within a budget.
 
-            if currentNode == graph.nodes[goal]:
-                path = self.createPath(currentNode)
-                return path
+        :param graph: The graph/maze the agent will traverse.
+        :param search: The search to perform, 0 for DFS, 1 for BFS and 2 for A*.
+        :param start: The starting node for the search.
+        :param goal: The goal node for the search.
+        :param budget: The time and expansions the search may spend, None for no limit.
+        :return: The result of the search.
+        """
 
-            for index in currentNode.neighbours:
-                neighbour = graph.nodes[index]
-                if not neighbour.visited and not neighbour.obstacle:
-                    neighbour.parent = currentNode
-                    queue.append(neighbour)
-                    neighbour.visited = True
+        searches = [self.solveDFS, self.solveBFS, self.solveAStar]
+        return searches[search](graph, start, goal, budget)
 
-        return {}
+    def solveDFS(self, graph: Graph, start: int, goal: int, budget: Budget = None) -> SearchResult:
+        """
+        Performs the DFS on a given graph/maze within a budget.
 
-    def AStar(self, graph: Graph, start: int, goal: int) -> dict:
+        :param graph: The graph/maze the agent will traverse.
+        :param start: The starting node for the search.
+        :param goal: The goal node for the search.
+        :param budget: The time and expansions the search may spend, None for no limit.
+        :return: The result of the search.
         """
-        Performs the A* search on a given graph/maze.
+
+        if budget is not None:
+            budget.start()
+        statistics = {"expanded": 0}
+        startTime = time.perf_counter()
+
+        state = self.acquireState(graph)
+        try:
+            stack = [start]
+            state.visit(start)
+
+            while stack:
+                currentNode = stack.pop()
+
+                if currentNode == goal:
+                    return SearchResult(SearchResult.SOLVED, self.createPath(graph, state, currentNode),
+                                        graph.heuristic(start, goal) + 1, statistics,
+                                        time.perf_counter() - startTime)
+
+                if budget is not None:
+                    status = budget.spend()
+                    if status is not None:
+                        return self.stopSearch(graph, state, goal, status, graph.heuristic(start, goal) + 1,
+                                               statistics, startTime)
+
+                statistics["expanded"] += 1
+
+                for index in graph.getNeighbours(currentNode):
+                    if not state.isVisited(index) and not graph.isObstacle(index):
+                        state.visit(index, currentNode)
+                        stack.append(index)
+
+            return SearchResult(SearchResult.UNSOLVABLE, None, None, statistics, time.perf_counter() - startTime)
+        finally:
+            self.releaseState(state)
+
+    def solveBFS(self, graph: Graph, start: int, goal: int, budget: Budget = None) -> SearchResult:
+        """
+        Performs the BFS on a given graph/maze within a budget.
+
+        Nodes are expanded in order of distance, so when the search is stopped the goal is no
+        closer than the node being expanded.
 
         :param graph: The graph/maze the agent will traverse.
         :param start: The starting node for the search.
         :param goal: The goal node for the search.
-        :return: The resulting path (if one has been found).
+        :param budget: The time and expansions the search may spend, None for no limit.
+        :return: The result of the search.
+        """
+
+        if budget is not None:
+            budget.start()
+        statistics = {"expanded": 0}
+        startTime = time.perf_counter()
+
+        state = self.acquireState(graph)
+        try:
+            queue = deque()
+            queue.append(start)
+            state.visit(start)
+
+            while queue:
+                currentNode = queue.popleft()
+
+                if currentNode == goal:
+                    return SearchResult(SearchResult.SOLVED, self.createPath(graph, state, currentNode),
+                                        state.gScore[currentNode] + 1, statistics,
+                                        time.perf_counter() - startTime)
+
+                if budget is not None:
+                    status = budget.spend()
+                    if status is not None:
+                        lowerBound = max(state.gScore[currentNode], graph.heuristic(start, goal)) + 1
+                        return self.stopSearch(graph, state, goal, status, lowerBound, statistics, startTime)
+
+                statistics["expanded"] += 1
+
+                gScore = state.gScore[currentNode] + 1
+                for index in graph.getNeighbours(currentNode):
+                    if not state.isVisited(index) and not graph.isObstacle(index):
+                        state.visit(index, currentNode, gScore)
+                        queue.append(index)
+
+            return SearchResult(SearchResult.UNSOLVABLE, None, None, statistics, time.perf_counter() - startTime)
+        finally:
+            self.releaseState(state)
+
+    def solveAStar(self, graph: Graph, start: int, goal: int, budget: Budget = None) -> SearchResult:
+        """
+        Performs the A* search on a given graph/maze within a budget.
+
+        Ties between nodes with equal f-scores are broken in favour of the larger g-score, then by
+        node id, so the search is deterministic and dives towards the goal on open maps. The lowest
+        f-score in the open set is a lower bound on the length of the path.
+
+        :param graph: The graph/maze the agent will traverse.
+        :param start: The starting node for the search.
+        :param goal: The goal node for the search.
+        :param budget: The time and expansions the search may spend, None for no limit.
+        :return: The result of the search.
         """
 
-        openSet = [(0, graph.nodes[start])]
-        heapq.heapify(openSet)
+        if budget is not None:
+            budget.start()
+        statistics = {"expanded": 0}
+        startTime = time.perf_counter()
+
+        state = self.acquireState(graph)
+        try:
+            openSet = PriorityQueue()
+            openSet.push(start, (graph.heuristic(start, goal), 0))
+            state.visit(start)
+
+            while openSet:
+                lowerBound = openSet.peek()[0] + 1
+                currentNode = openSet.pop()
 
-        while openSet:
-            currentNode = heapq.heappop(openSet)[1]
+                if currentNode == goal:
+                    return SearchResult(SearchResult.SOLVED, self.createPath(graph, state, currentNode), lowerBound,
+                                        statistics, time.perf_counter() - startTime)
 
-            if currentNode == graph.nodes[goal]:
-                path = self.createPath(currentNode)
-                return path
+                if budget is not None:
+                    status = budget.spend()
+                    if status is not None:
+                        return self.stopSearch(graph, state, goal, status, lowerBound, statistics, startTime)
 
-            currentNode.visited = True
+                statistics["expanded"] += 1
 
-            for index in currentNode.neighbours:
-                neighbour = graph.nodes[index]
+                state.close(currentNode)
 
-                if neighbour.obstacle or neighbour.visited:
-                    continue
+                tempGScore = state.gScore[currentNode] + 1
+                for index in graph.getNeighbours(currentNode):
+                    if graph.isObstacle(index) or state.isClosed(index):
+                        continue
 
-                tempGScore = currentNode.gScore + 1
-                if neighbour not in openSet or tempGScore < neighbour.gScore:
-                    neighbour.parent = currentNode
-                    neighbour.gScore = tempGScore
-                    neighbour.fScore = tempGScore + graph.heuristic(index, goal)
+                    if not state.isVisited(index) or tempGScore < state.gScore[index]:
+                        state.visit(index, currentNode, tempGScore)
+                        openSet.push(index, (tempGScore + graph.heuristic(index, goal), -tempGScore))
+
+            return SearchResult(SearchResult.UNSOLVABLE, None, None, statistics, time.perf_counter() - startTime)
+        finally:
+            self.releaseState(state)
+
+    def stopSearch(self, graph: Graph, state: SearchState, goal: int, status: str, lowerBound: int,
+                   statistics: dict, startTime: float) -> SearchResult:
+        """
+        Creates the result of a search stopped by its budget.
+
+        The best partial solution is the path towards the visited node closest to the goal.
+
+        :param graph: The graph/maze that was searched.
+        :param state: The search state of the stopped search.
+        :param goal: The goal node of the search.
+        :param status: Why the search was stopped.
+        :param lowerBound: The lower bound on the length of the path.
+        :param statistics: The statistics of the stopped search.
+        :param startTime: The time the search started at.
+        :return: The result of the search.
+        """
 
-                    if neighbour not in openSet:
-                        heapq.heappush(openSet, (neighbour.fScore, neighbour))
+        closest = min([index for index in range(state.size) if state.isVisited(index)],
+                      key=lambda index: graph.heuristic(index, goal))
+        return SearchResult(status, self.createPath(graph, state, closest), lowerBound, statistics,
+                            time.perf_counter() - startTime)
+
+    def acquireState(self, graph: Graph) -> SearchState:
+        """
+        Takes a reset search state for a given graph/maze from the pool.
+
+        :param graph: The graph/maze to be searched.
+        :return: A search state large enough for the graph/maze.
+        """
+
+        size = graph.width * graph.height
+        while True:
+            try:
+                state = self.states.pop()
+            except IndexError:
+                return SearchState(size)
+            if state.size == size:
+                state.reset()
+                return state
+
+    def releaseState(self, state: SearchState):
+        """
+        Returns a search state to the pool.
+
+        :param state: The search state to be reused.
+        """
 
-        return {}
+        self.states.append(state)
 
-    def createPath(self, node: Node):
+    def createPath(self, graph: Graph, state: SearchState, node: int) -> dict:
         """
         Creates a path from the given node to its origin.
 
+        :param graph: The graph/maze that was searched.
+        :param state: The search state holding the parent of each node.
         :param node: The node to create the path from.
-        :return: List of nodes representing the path.
+        :return: The path in the solution format used by the model.
         """
 
-        path = []
-        parent = node
-        while parent.parent is not None:
-            path.append(parent)
-            parent = parent.parent
-        path.append(parent)
-        path.reverse()
+        path = state.getPath(node)
 
         if not path:
             return {}
@@ -144,10 +318,11 @@ class SingleAgent:
         solution = {"agent0": []}
         counter = 0
         for position in path:
+            y, x = divmod(position, graph.width)
             solution["agent0"].append({
                 "t": counter,
-                "x": position.yPos,
-                "y": position.xPos})
+                "x": y,
+                "y": x})
             counter += 1
 
         return solution
@@ -1,34 +1,77 @@
-from copy import deepcopy
-from itertools import combinations
-from math import fabs
-
+import time
+from collections import Counter
+from functools import partial
+
+from src.model.agents.FocalList import FocalList
+from src.model.agents.PriorityQueue import PriorityQueue
+from src.model.agents.SearchResult import SearchResult
+from src.model.agents.SearchStopped import SearchStopped
 from src.model.agents.cbs.CBSUtils import *
+from src.model.agents.cbs.ConflictAvoidanceTable import ConflictAvoidanceTable
+from src.model.agents.cbs.ConflictTable import ConflictTable
+from src.model.agents.cbs.MDD import MDD
 
 
 class ConstraintTreeNode:
     """
     A node of the constraint tree build by Conflict-Based Search.
 
+    Nodes are persistent: a child only stores the constraint it adds, the paths it replanned and a
+    pointer to its parent, and every other path and constraint is shared with its ancestors. Paths
+    are never modified once stored. Two nodes are considered equal when they hold the same
+    constraints, as the low-level search is deterministic and would find the same solution for both.
+    The key of a node is the key of its parent plus the hashes of the constraints it adds, so it
+    does not depend on the order the constraints were added in, and the constraints of two nodes
+    are only collected and compared when their keys are equal.
+
     Attributes:
-        constraints (dict): The set of vertex and edge constraints for each agent.
-        solution (dict): The current solution to the node.
+        parent (ConstraintTreeNode): The parent node, None for the root.
+        agent (str): The agent constrained by this node, None for the root.
+        constraints (Constraints): The constraints added by this node for its agent.
+        paths (dict): The paths replanned in this node, the path of every agent for the root.
+        bounds (dict): The lower bound on the cost of each path in paths.
         cost (int): The total cost of the solution.
+        lowerBound (int): The total lower bound on the cost of the paths, equal to cost for optimal paths.
+        conflicts (int): The number of conflicts in the solution.
+        conflictTable (ConflictTable): The conflicts between the paths of the solution.
+        depth (int): The depth of the node in the constraint tree.
+        key (int): The sum of the hashes of the constraints of every agent, 0 for the root.
 
     Methods:
-        __init__(self): Initializes the constraint tree node.
+        __init__(self, parent, agent, constraints): Initializes the constraint tree node.
         __eq__(self, other): Checks if the constraint tree node is equal to other constraint tree node.
         __hash__(self): Returns the hash of the constraint tree node.
         __lt__(self, other): Checks if the constraint tree node is less than other constraint tree node.
+        getConstraints(self, agent): Returns every constraint on an agent in this node.
+        getSolution(self): Returns the path of every agent in this node.
+        getBound(self, agent): Returns the lower bound on the cost of an agent's path in this node.
+        getKey(self): Returns the sum of the hashes of the constraints of every agent.
+        getConstraintKeys(self): Returns the constraints of every agent as packed keys.
     """
 
-    def __init__(self):
+    __slots__ = ("parent", "agent", "constraints", "paths", "bounds", "cost", "lowerBound", "conflicts",
+                 "conflictTable", "depth", "key")
+
+    def __init__(self, parent=None, agent=None, constraints=None):
         """
         Initializes the constraint tree node.
+
+        :param parent: The parent node, None for the root.
+        :param agent: The agent constrained by this node.
+        :param constraints: The constraints added by this node for its agent.
         """
 
-        self.constraints = {}
-        self.solution = {}
+        self.parent = parent
+        self.agent = agent
+        self.constraints = constraints
+        self.paths = {}
+        self.bounds = {}
         self.cost = 0
+        self.lowerBound = 0
+        self.conflicts = 0
+        self.conflictTable = None
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.key = 0 if parent is None else parent.key + sum([hash((agent,) + key) for key in constraints.getKey()])
 
     def __eq__(self, other):
         """
@@ -40,7 +83,11 @@ class ConstraintTreeNode:
 
         if not isinstance(other, type(self)):
             return NotImplemented
-        return self.solution == other.solution and self.cost == other.cost
+        if self is other:
+            return True
+        if self.key != other.key:
+            return False
+        return Counter(self.getConstraintKeys()) == Counter(other.getConstraintKeys())
 
     def __hash__(self):
         """
@@ -49,37 +96,165 @@ class ConstraintTreeNode:
         :return: The hash of the constraint tree node.
         """
 
-        return hash(self.cost)
+        return hash(self.key)
 
     def __lt__(self, other):
         """
         Checks if the constraint tree node is less than other constraint tree node.
 
+        Nodes are ordered by cost, then by number of conflicts, then deepest first.
+
         :param other: The other constraint tree node.
         :return: Boolean value indicating if the constraint tree node is less than other constraint tree node.
         """
 
-        return self.cost < other.cost
+        return (self.cost, self.conflicts, -self.depth) < (other.cost, other.conflicts, -other.depth)
+
+    def getConstraints(self, agent):
+        """
+        Returns every constraint on an agent in this node.
+
+        Positive constraints on other agents are turned into the negative constraints they imply.
+
+        :param agent: The agent to collect the constraints of.
+        :return: The constraints on the agent added by this node and its ancestors.
+        """
+
+        constraints = Constraints()
+        node = self
+        while node.parent is not None:
+            if node.agent == agent:
+                constraints.add(node.constraints)
+            elif node.constraints.positive_constraints:
+                constraints.add(node.constraints.getImplied())
+            node = node.parent
+        return constraints
+
+    def getSolution(self):
+        """
+        Returns the path of every agent in this node.
+
+        :return: Dictionary of the latest path of each agent.
+        """
+
+        paths = {}
+        node = self
+        while node.parent is not None:
+            for agent, path in node.paths.items():
+                paths.setdefault(agent, path)
+            node = node.parent
+        return {agent: paths.get(agent, path) for agent, path in node.paths.items()}
+
+    def getBound(self, agent):
+        """
+        Returns the lower bound on the cost of an agent's path in this node.
+
+        :param agent: The agent.
+        :return: The lower bound of the latest path of the agent.
+        """
+
+        node = self
+        while agent not in node.bounds:
+            node = node.parent
+        return node.bounds[agent]
+
+    def getKey(self):
+        """
+        Returns the sum of the hashes of the constraints of every agent.
+
+        :return: The key of the node.
+        """
+
+        return self.key
+
+    def getConstraintKeys(self):
+        """
+        Returns the constraints of every agent as packed keys.
+
+        :return: List of (agent, constraint type, constraint key) entries, added by this node and its ancestors.
+        """
+
+        keys = []
+        node = self
+        while node.parent is not None:
+            keys.extend([(node.agent,) + key for key in node.constraints.getKey()])
+            node = node.parent
+        return keys
 
 
 class CBS:
     """
     Class implementing the Conflict-Based Search algorithm.
 
+    Constraint tree nodes are kept in a focal list ordered by the lower bound on their cost, and the
+    node expanded next is the one with the fewest conflicts among the nodes whose cost is within
+    the suboptimality factor of the lowest bound. CBS plans optimal paths, so its bounds equal its
+    costs and with a factor of 1 nodes are expanded in order of cost, then of conflicts.
+
+    When conflicts are prioritised (ICBS), each conflict is classified with the multi-valued decision
+    diagrams of its agents, and cardinal conflicts are split on before semi-cardinal conflicts,
+    which are split on before non-cardinal conflicts. When conflicts are bypassed, a child whose
+    replanned path costs the same as its parent's and has fewer conflicts is adopted by the parent
+    instead of branching. With disjoint splitting, a conflict is split on one of its agents into a
+    child that forbids the agent from the conflicting location (or move) and a child that requires
+    it, which in turn forbids every other agent from it, so the two children share no solutions.
+
+    Attributes:
+        POLL_INTERVAL (int): The number of low-level expansions between polls of the budget.
+        prioritiseConflicts (bool): Whether to split on cardinal conflicts first.
+        bypassConflicts (bool): Whether to adopt a child's path into its parent instead of branching.
+        disjointSplitting (bool): Whether to split conflicts into a negative and a positive constraint.
+        suboptimality (float): The factor the cost of a solution may exceed the optimal cost by, 1 for CBS.
+        mdds (dict): The decision diagrams built in the current search, keyed by agent, cost and constraints.
+        statistics (dict): The number of nodes expanded, generated and bypassed in the last search.
+
     Methods:
-        __init__(self): Initializes the Conflict-Based Search algorithm.
+        __init__(self, prioritiseConflicts, bypassConflicts, disjointSplitting): Initializes the Conflict-Based Search
+            algorithm.
         search(self, graph, waypoints): Performs the Conflict-Based Search algorithm.
+        solve(self, graph, waypoints, budget): Performs the Conflict-Based Search algorithm within a budget.
+        stopSearch(self, status, best, lowerBound, startTime): Creates the result of a stopped search.
+        createRoot(self, graph, waypoints, budget): Creates the root of the constraint tree.
+        createPlan(self, solution): Turns a solution into the plan returned by the search.
+        generateChildren(self, graph, waypoints, node, solution, conflict, closedSet, budget): Splits a node on a
+            conflict.
+        createChildren(self, node, solution, conflict, closedSet): Creates the children of a node for a conflict.
+        replanAgents(self, graph, waypoints, solution, agents, budget): Replans agents one after the other.
+        completeChild(self, node, child, solution, replanned): Stores the replanned paths in a child.
+        findBypass(self, node, children): Finds a child whose path can be adopted by its parent.
         getConflict(self, solution): Gets first conflict from the solution.
-        getConstraints(self, conflict): Turns conflict into two constraints.
-        getSolution(self, graph, waypoints, constraints): Creates a solution that adheres to the current constraints.
-        AStarWithConstraints(self, graph, start, goal, constraints): Performs A* with constraints.
+        chooseConflict(self, graph, waypoints, node, solution): Chooses the conflict to split a node on.
+        classifyConflict(self, graph, conflict, mddOne, mddTwo): Classifies a conflict by its cardinality.
+        getMDD(self, graph, waypoints, node, agent, cost): Returns the decision diagram of an agent.
+        countConflicts(self, solution): Counts the conflicts in the solution.
+        createConstraintsFromConflict(self, conflict): Turns conflict into two constraints.
+        createDisjointConstraints(self, conflict): Turns conflict into a negative and a positive constraint.
+        computeSolution(self, graph, waypoints, constraints, bounds, budget): Creates a solution that adheres to the
+            constraints.
+        planPath(self, graph, waypoint, constraints, conflictAvoidance, budget): Plans the path of a single agent.
+        pollBudget(self, budget): Polls the budget from a low-level search.
+        getDistances(self, graph, goalCell, budget): Returns the distance table of a goal, polling the budget.
+        AStarWithConstraints(self, graph, start, goal, constraints, conflictAvoidance, budget): Performs A* with
+            constraints.
     """
 
-    def __init__(self):
+    POLL_INTERVAL = 256
+
+    def __init__(self, prioritiseConflicts=False, bypassConflicts=False, disjointSplitting=False):
         """
         Initializes the Conflict-Based Search algorithm.
+
+        :param prioritiseConflicts: Whether to split on cardinal conflicts first.
+        :param bypassConflicts: Whether to adopt a child's path into its parent instead of branching.
+        :param disjointSplitting: Whether to split conflicts into a negative and a positive constraint.
         """
-        pass
+
+        self.prioritiseConflicts = prioritiseConflicts
+        self.bypassConflicts = bypassConflicts
+        self.disjointSplitting = disjointSplitting
+        self.suboptimality = 1
+        self.mdds = {}
+        self.statistics = {"expanded": 0, "generated": 0, "bypassed": 0}
 
     def search(self, graph, waypoints):
         """
@@ -90,47 +265,261 @@ class CBS:
         :return: The solution found by the search.
         """
 
-        root = ConstraintTreeNode()
-        root.constraints = {agent: Constraints() for agent in waypoints.keys()}
-        root.solution = self.computeSolution(graph, waypoints, root.constraints)
-        if not root.solution:
-            return {}
-        root.cost = sum([len(path) for path in root.solution.values()])
+        return self.solve(graph, waypoints).solution
 
-        openSet = set()
-        closedSet = set()
+    def solve(self, graph, waypoints, budget=None):
+        """
+        Performs the Conflict-Based Search within a budget.
 
-        openSet |= {root}
+        The budget is spent once per constraint tree node expanded, and polled by the low-level
+        searches as they plan the root and the children. When it runs out, the result holds the
+        expanded solution with the fewest conflicts and the lowest lower bound in the open list, or
+        no solution if the root was still being planned.
 
-        while openSet:
-            P = min(openSet)
-            openSet -= {P}
-            closedSet |= {P}
-
-            C = self.getConflict(P.solution)
-            if not C:
-                plan = {}
-                for agent, path in P.solution.items():
-                    path_dict_list = [{'t': state.time, 'x': state.location.x, 'y': state.location.y} for state in path]
-                    plan[agent] = path_dict_list
-                return plan
-
-            newConstraints = self.createConstraintsFromConflict(C)
-
-            for agent in newConstraints.keys():
-                A = deepcopy(P)
-                A.constraints[agent].vertex_constraints |= newConstraints[agent].vertex_constraints
-                A.constraints[agent].edge_constraints |= newConstraints[agent].edge_constraints
-
-                A.solution = self.computeSolution(graph, waypoints, A.constraints)
-                if not A.solution:
+        :param graph: The graph to traverse.
+        :param waypoints: The start and goal waypoints of the agents in the search.
+        :param budget: The time and expansions the search may spend, None for no limit.
+        :return: The result of the search.
+        """
+
+        if budget is not None:
+            budget.start()
+        startTime = time.perf_counter()
+        self.mdds = {}
+        self.statistics = {"expanded": 0, "generated": 0, "bypassed": 0}
+        best = None
+        lowerBound = None
+
+        try:
+            root = self.createRoot(graph, waypoints, budget)
+            if root is None:
+                return SearchResult(SearchResult.UNSOLVABLE, None, None, self.statistics,
+                                    time.perf_counter() - startTime)
+            self.statistics["generated"] += 1
+
+            openSet = FocalList(self.suboptimality)
+            openSet.push(root, root.lowerBound, root.cost, (root.conflicts, root.cost, -root.depth))
+            closedSet = set()
+            best = root
+
+            while openSet:
+                lowerBound = openSet.getLowerBound()
+                P = openSet.pop()
+                if P in closedSet:
                     continue
-                A.cost = sum([len(path) for path in A.solution.values()])
 
-                if A not in closedSet:
-                    openSet |= {A}
+                if budget is not None:
+                    status = budget.spend()
+                    if status is not None:
+                        return self.stopSearch(status, best, lowerBound, startTime)
+
+                closedSet.add(P)
+                self.statistics["expanded"] += 1
+
+                while True:
+                    if (P.conflicts, P.cost) < (best.conflicts, best.cost):
+                        best = P
+                    solution = P.getSolution()
+                    C = self.chooseConflict(graph, waypoints, P, solution)
+                    if not C:
+                        return SearchResult(SearchResult.SOLVED, self.createPlan(solution), lowerBound,
+                                            self.statistics, time.perf_counter() - startTime)
+
+                    children = self.generateChildren(graph, waypoints, P, solution, C, closedSet, budget)
+
+                    bypass = self.findBypass(P, children) if self.bypassConflicts else None
+                    if bypass is None:
+                        break
+                    P = bypass
+                    self.statistics["bypassed"] += 1
+
+                for A in children:
+                    openSet.push(A, A.lowerBound, A.cost, (A.conflicts, A.cost, -A.depth))
+                    self.statistics["generated"] += 1
+        except SearchStopped as stopped:
+            return self.stopSearch(stopped.status, best, lowerBound, startTime)
+
+        return SearchResult(SearchResult.UNSOLVABLE, None, None, self.statistics, time.perf_counter() - startTime)
+
+    def stopSearch(self, status, best, lowerBound, startTime):
+        """
+        Creates the result of a search stopped by its budget.
+
+        :param status: Why the search was stopped.
+        :param best: The expanded node with the fewest conflicts, None if the root was not planned.
+        :param lowerBound: The lowest lower bound in the open list, None if the root was not planned.
+        :param startTime: The time the search started at.
+        :return: The result of the search, holding the solution of the best node.
+        """
+
+        solution = self.createPlan(best.getSolution()) if best is not None else None
+        return SearchResult(status, solution, lowerBound, self.statistics, time.perf_counter() - startTime)
+
+    def createRoot(self, graph, waypoints, budget=None):
+        """
+        Creates the root of the constraint tree, planning every agent without constraints.
+
+        :param graph: The graph to traverse.
+        :param waypoints: The start and goal waypoints of the agents in the search.
+        :param budget: The budget polled by the low-level searches, None for no limit.
+        :raises SearchStopped: If the budget runs out while planning.
+        :return: The root node, None if an agent cannot reach its goal.
+        """
+
+        root = ConstraintTreeNode()
+        root.paths = self.computeSolution(graph, waypoints, {agent: Constraints() for agent in waypoints.keys()},
+                                          root.bounds, budget)
+        if not root.paths:
+            return None
+        root.cost = sum([len(path) for path in root.paths.values()])
+        root.lowerBound = sum(root.bounds.values())
+        root.conflictTable = ConflictTable.fromSolution(root.paths)
+        root.conflicts = len(root.conflictTable)
+        return root
+
+    def createPlan(self, solution):
+        """
+        Turns a solution into the plan returned by the search.
+
+        :param solution: The path of every agent.
+        :return: Dictionary of the timed locations of each agent.
+        """
+
+        plan = {}
+        for agent, path in solution.items():
+            path_dict_list = [{'t': state.time, 'x': state.location.x, 'y': state.location.y} for state in path]
+            plan[agent] = path_dict_list
+        return plan
+
+    def generateChildren(self, graph, waypoints, node, solution, conflict, closedSet, budget=None):
+        """
+        Splits a node on a conflict, replanning the agents whose paths break the new constraints.
+
+        :param graph: The graph to traverse.
+        :param waypoints: The start and goal waypoints of the agents in the search.
+        :param node: The constraint tree node being expanded.
+        :param solution: The path of every agent in the node.
+        :param conflict: The conflict to split on.
+        :param closedSet: The nodes that have already been expanded.
+        :param budget: The budget polled by the low-level searches, None for no limit.
+        :raises SearchStopped: If the budget runs out while replanning.
+        :return: The children of the node that have a solution.
+        """
+
+        children = []
+        for A, replan in self.createChildren(node, solution, conflict, closedSet):
+            replanned = self.replanAgents(graph, waypoints, solution,
+                                          [(agent, A.getConstraints(agent)) for agent in replan], budget)
+            if replanned is not None:
+                self.completeChild(node, A, solution, replanned)
+                children.append(A)
+        return children
+
+    def createChildren(self, node, solution, conflict, closedSet):
+        """
+        Creates the children of a node for a conflict, along with the agents each child must replan.
+
+        A negative constraint only affects the constrained agent, while a positive constraint
+        affects every other agent that uses its location or move.
+
+        :param node: The constraint tree node being expanded.
+        :param solution: The path of every agent in the node.
+        :param conflict: The conflict to split on.
+        :param closedSet: The nodes that have already been expanded.
+        :return: List of (child, agents to replan) pairs for the children that have not been expanded.
+        """
+
+        if self.disjointSplitting:
+            splits = self.createDisjointConstraints(conflict)
+        else:
+            splits = list(self.createConstraintsFromConflict(conflict).items())
+
+        children = []
+        for agent, constraints in splits:
+            A = ConstraintTreeNode(node, agent, constraints)
+            if A in closedSet:
+                continue
+
+            replan = [agent] if not constraints.isSatisfiedBy(solution[agent]) else []
+            if constraints.positive_constraints:
+                implied = constraints.getImplied()
+                replan.extend([other for other, path in solution.items()
+                               if other != agent and not implied.isSatisfiedBy(path)])
+            children.append((A, replan))
+        return children
+
+    def replanAgents(self, graph, waypoints, solution, agents, budget=None):
+        """
+        Replans agents one after the other, each avoiding the latest paths of the rest.
+
+        :param graph: The graph to traverse.
+        :param waypoints: The start and goal waypoints of the agents in the search.
+        :param solution: The path of every agent before replanning.
+        :param agents: List of (agent, constraints) pairs to replan in order.
+        :param budget: The budget polled by the low-level searches, None for no limit.
+        :raises SearchStopped: If the budget runs out while replanning.
+        :return: List of (agent, path, lower bound) entries, None if an agent has no path.
+        """
 
-        return {}
+        paths = dict(solution)
+        replanned = []
+        for agent, constraints in agents:
+            conflictAvoidance = ConflictAvoidanceTable(graph, [otherPath for other, otherPath in paths.items()
+                                                               if other != agent])
+            path, bound = self.planPath(graph, waypoints[agent], constraints, conflictAvoidance, budget)
+            if not path:
+                return None
+            paths[agent] = path
+            replanned.append((agent, path, bound))
+        return replanned
+
+    def completeChild(self, node, child, solution, replanned):
+        """
+        Stores the replanned paths in a child and updates its cost, lower bound and conflicts.
+
+        :param node: The parent of the child.
+        :param child: The child node.
+        :param solution: The path of every agent in the parent.
+        :param replanned: List of (agent, path, lower bound) entries.
+        """
+
+        paths = dict(solution)
+        child.cost = node.cost
+        child.lowerBound = node.lowerBound
+        child.conflictTable = node.conflictTable
+        for agent, path, bound in replanned:
+            child.cost += len(path) - len(paths[agent])
+            child.lowerBound += bound - node.getBound(agent)
+            paths[agent] = path
+            child.paths[agent] = path
+            child.bounds[agent] = bound
+            child.conflictTable = child.conflictTable.update(paths, agent)
+        child.conflicts = len(child.conflictTable)
+
+    def findBypass(self, node, children):
+        """
+        Finds a child whose replanned paths can be adopted by its parent instead of branching.
+
+        A child's paths satisfy every constraint of its parent, so if they cost the same and leave
+        fewer conflicts, the parent can take the paths and be split again on a remaining conflict.
+
+        :param node: The constraint tree node being expanded.
+        :param children: The children of the node.
+        :return: The node holding the adopted paths, None if no child can be bypassed.
+        """
+
+        for A in children:
+            if A.cost == node.cost and A.conflicts < node.conflicts:
+                bypass = ConstraintTreeNode(node, A.agent, Constraints())
+                bypass.paths = A.paths
+                bypass.bounds = A.bounds
+                bypass.cost = A.cost
+                bypass.lowerBound = A.lowerBound
+                bypass.conflictTable = A.conflictTable
+                bypass.conflicts = A.conflicts
+                bypass.depth = node.depth
+                return bypass
+        return None
 
     def getConflict(self, solution):
         """
@@ -140,22 +529,91 @@ class CBS:
         :return: The first conflict from the solution.
         """
 
-        maxTime = max([len(path) for path in solution.values()])
-        for t in range(maxTime):
-            for agentOne, agentTwo in combinations(solution.keys(), 2):
-                stateOneA = solution[agentOne][t] if t < len(solution[agentOne]) else solution[agentOne][-1]
-                stateOneB = solution[agentOne][t + 1] if (t + 1) < len(solution[agentOne]) else solution[agentOne][-1]
+        return ConflictTable.fromSolution(solution).getFirst()
 
-                stateTwoA = solution[agentTwo][t] if t < len(solution[agentTwo]) else solution[agentTwo][-1]
-                stateTwoB = solution[agentTwo][t + 1] if (t + 1) < len(solution[agentTwo]) else solution[agentTwo][-1]
+    def chooseConflict(self, graph, waypoints, node, solution):
+        """
+        Chooses the conflict to split a node on.
 
-                if stateOneA.location == stateTwoA.location:
-                    return Conflict(t, 1, agentOne, agentTwo, stateOneA.location)
+        :param graph: The graph to traverse.
+        :param waypoints: The start and goal waypoints of the agents in the search.
+        :param node: The constraint tree node being expanded.
+        :param solution: The path of every agent in the node.
+        :return: The conflict to split on, False if the node has no conflicts.
+        """
 
-                if stateOneA.location == stateTwoB.location and stateOneB.location == stateTwoA.location:
-                    return Conflict(t, 2, agentOne, agentTwo, stateOneA.location, stateOneB.location)
+        if not self.prioritiseConflicts:
+            return node.conflictTable.getFirst()
+
+        order = node.conflictTable.order
+        conflicts = sorted(node.conflictTable.getConflicts(),
+                           key=lambda c: (c.time, order[c.agent_1], order[c.agent_2]))
+
+        best = False
+        bestCardinality = -1
+        for conflict in conflicts:
+            mddOne = self.getMDD(graph, waypoints, node, conflict.agent_1, len(solution[conflict.agent_1]))
+            mddTwo = self.getMDD(graph, waypoints, node, conflict.agent_2, len(solution[conflict.agent_2]))
+            cardinality = self.classifyConflict(graph, conflict, mddOne, mddTwo)
+            if cardinality > bestCardinality:
+                best = conflict
+                bestCardinality = cardinality
+                if cardinality == 2:
+                    break
+        return best
+
+    def classifyConflict(self, graph, conflict, mddOne, mddTwo):
+        """
+        Classifies a conflict by its cardinality.
 
-        return False
+        A conflict is cardinal for an agent when every optimal path of that agent passes through the
+        conflicting location (or move), so resolving it must increase the agent's cost.
+
+        :param graph: The graph to traverse.
+        :param conflict: The conflict to classify.
+        :param mddOne: The decision diagram of the first agent.
+        :param mddTwo: The decision diagram of the second agent.
+        :return: 2 for a cardinal conflict, 1 for a semi-cardinal conflict and 0 otherwise.
+        """
+
+        cellOne = conflict.location_1.x * graph.width + conflict.location_1.y
+        if conflict.type == 1:
+            return mddOne.isSingleton(conflict.time, cellOne) + mddTwo.isSingleton(conflict.time, cellOne)
+
+        cellTwo = conflict.location_2.x * graph.width + conflict.location_2.y
+        cardinalOne = mddOne.isSingleton(conflict.time, cellOne) and mddOne.isSingleton(conflict.time + 1, cellTwo)
+        cardinalTwo = mddTwo.isSingleton(conflict.time, cellTwo) and mddTwo.isSingleton(conflict.time + 1, cellOne)
+        return cardinalOne + cardinalTwo
+
+    def getMDD(self, graph, waypoints, node, agent, cost):
+        """
+        Returns the decision diagram of an agent, building it if it is not cached.
+
+        :param graph: The graph to traverse.
+        :param waypoints: The start and goal waypoints of the agents in the search.
+        :param node: The constraint tree node holding the agent's constraints.
+        :param agent: The agent.
+        :param cost: The cost of the agent's path.
+        :return: The decision diagram of the agent's optimal paths.
+        """
+
+        constraints = node.getConstraints(agent)
+        key = (agent, cost, constraints.getKey())
+        mdd = self.mdds.get(key)
+        if mdd is None:
+            mdd = MDD(graph, waypoints[agent]['start'], waypoints[agent]['goal'], cost, constraints)
+            self.mdds[key] = mdd
+        return mdd
+
+    def countConflicts(self, solution):
+        """
+        Counts the conflicts in the solution.
+
+        :param solution: The solution found by the search.
+        :return: The number of vertex and edge conflicts between every pair of agents.
+        """
+
+        return len(ConflictTable.fromSolution(solution))
 
     def createConstraintsFromConflict(self, conflict):
         """
@@ -180,89 +638,213 @@ class CBS:
 
         return constraints
 
-    def computeSolution(self, graph, waypoints, constraints):
+    def createDisjointConstraints(self, conflict):
+        """
+        Turns conflict into a negative and a positive constraint on its first agent.
+
+        The negative child forbids the first agent from the conflicting location (or move), and the
+        positive child requires it, which forbids every other agent from it. A positive move is
+        stored as positive constraints on both of its ends.
+
+        :param conflict: Conflict from the solution.
+        :return: List of (agent, constraints) pairs, one for each child.
+        """
+
+        agent = conflict.agent_1
+        if conflict.type == 1:
+            negative = Constraints(vertex=VertexConstraint(conflict.time, conflict.location_1))
+            positive = Constraints(positive=VertexConstraint(conflict.time, conflict.location_1))
+        else:
+            negative = Constraints(edge=EdgeConstraint(conflict.time, conflict.location_1, conflict.location_2))
+            positive = Constraints(positive=VertexConstraint(conflict.time, conflict.location_1))
+            positive.addPositive(VertexConstraint(conflict.time + 1, conflict.location_2))
+        return [(agent, negative), (agent, positive)]
+
+    def computeSolution(self, graph, waypoints, constraints, bounds=None, budget=None):
         """
         Creates a solution that adheres to the current constraints.
 
         :param graph: The graph to traverse.
         :param waypoints: The start and goal waypoints of the agents in the search.
         :param constraints: The current constraints.
+        :param bounds: Dictionary to store the lower bound on the cost of each agent's path in.
+        :param budget: The budget polled by the low-level searches, None for no limit.
+        :raises SearchStopped: If the budget runs out while planning.
         :return: The solution found by the search.
         """
 
         solution = {}
+        conflictAvoidance = ConflictAvoidanceTable(graph)
         for agent in waypoints.keys():
             agentConstraints = constraints.setdefault(agent, Constraints())
-            agentSolution = self.AStarWithConstraints(graph, waypoints[agent]['start'], waypoints[agent]['goal'],
-                                                      agentConstraints)
+            agentSolution, bound = self.planPath(graph, waypoints[agent], agentConstraints, conflictAvoidance, budget)
             if not agentSolution:
                 return False
             solution.update({agent: agentSolution})
+            if bounds is not None:
+                bounds[agent] = bound
+            conflictAvoidance.addPath(agentSolution)
         return solution
 
-    def AStarWithConstraints(self, graph, start, goal, constraints):
+    def planPath(self, graph, waypoint, constraints, conflictAvoidance, budget=None):
         """
-        Performs A* with constraints.
+        Plans the path of a single agent with the low-level search.
 
         :param graph: The graph to traverse.
-        :param start: The start location of the agent.
-        :param goal: The goal location of the agent.
-        :param constraints: The current constraints.
-        :return: Agent path from the start location to the goal location.
+        :param waypoint: The start and goal of the agent.
+        :param constraints: The constraints of the agent.
+        :param conflictAvoidance: The paths of the other agents to avoid where possible.
+        :param budget: The budget polled by the low-level search, None for no limit.
+        :raises SearchStopped: If the budget runs out while planning.
+        :return: Tuple of the path, False if there is none, and a lower bound on its cost.
         """
 
-        open_set = {start}
-        closed_set = set()
+        path = self.AStarWithConstraints(graph, waypoint['start'], waypoint['goal'], constraints, conflictAvoidance,
+                                         budget)
+        return path, len(path) if path else 0
 
-        came_from = {}
-        g_score = {start: 0}
-        f_score = {start: (fabs(start.location.x - goal.location.x) + fabs(start.location.y - goal.location.y))}
+    def pollBudget(self, budget):
+        """
+        Polls the budget from a low-level search.
+
+        :param budget: The budget of the search.
+        :raises SearchStopped: If the budget has run out.
+        """
+
+        status = budget.poll()
+        if status is not None:
+            raise SearchStopped(status)
+
+    def getDistances(self, graph, goalCell, budget=None):
+        """
+        Returns the distance table of a goal, polling the budget while a new table is built.
 
-        while open_set:
-            temp_dict = {open_item: f_score.setdefault(open_item, float("inf")) for open_item in open_set}
-            current = min(temp_dict, key=temp_dict.get)
+        :param graph: The graph to traverse.
+        :param goalCell: The cell of the goal.
+        :param budget: The budget polled once per level of the breadth-first search, None for no limit.
+        :raises SearchStopped: If the budget runs out while the table is built.
+        :return: The distance of each cell to the goal, -1 for cells that cannot reach it.
+        """
 
-            if current.location == goal.location:
-                total_path = [current]
-                while current in came_from.keys():
-                    current = came_from[current]
-                    total_path.append(current)
-                return total_path[::-1]
+        return graph.getDistances(goalCell, partial(self.pollBudget, budget) if budget is not None else None)
 
-            open_set -= {current}
-            closed_set |= {current}
+    def AStarWithConstraints(self, graph, start, goal, constraints, conflictAvoidance=None, budget=None):
+        """
+        Performs A* with constraints.
 
-            neighbors = []
+        The search runs over (time, location) states packed into integer keys (time * cells + cell),
+        ordered by a heap on (f, conflicts, -g) and using the true distance to the goal as its
+        heuristic. As every move or wait costs one step, the g-score of a state is its time and
+        never changes, but its conflict count can: a queued state reached again with fewer conflicts
+        is pushed again with its new parent, and the outdated heap entry is skipped when popped.
+        States later than the last constraint plus the number of cells cannot be part of an optimal
+        path, which bounds the search when the goal cannot be reached.
 
-            directions = [(0, 0), (0, 1), (0, -1), (-1, 0), (1, 0)]
+        Constraints are probed through their packed keys, states away from a positive constraint's
+        location at its time are skipped, and the goal is only accepted after the last vertex
+        constraint on it and the last positive constraint elsewhere, so the returned path is the
+        earliest arrival at which the agent can stay at its goal without violating a constraint.
 
-            for x, y in directions:
-                nextLocation = Location(current.location.x + x, current.location.y + y)
-                nextState = State(current.time + 1, nextLocation)
+        When a conflict avoidance table is given, states with equal f-scores are ordered by the
+        number of conflicts with the other agents' paths along the way, so among the optimal paths
+        the one that collides least is returned.
 
-                if 0 <= nextState.location.x < graph.width \
-                        and 0 <= nextState.location.y < graph.height \
-                        and VertexConstraint(nextState.time, nextState.location) not in constraints.vertex_constraints \
-                        and (nextState.location.x, nextState.location.y) not in graph.getObstacles() \
-                        and EdgeConstraint(current.time, current.location,
-                                           nextState.location) not in constraints.edge_constraints:
-                    neighbors.append(nextState)
+        The budget is polled every POLL_INTERVAL expansions, as a single low-level search on a large
+        graph can run for far longer than the time limit of the whole search.
 
-            for neighbor in neighbors:
-                if neighbor in closed_set:
+        :param graph: The graph to traverse.
+        :param start: The start location of the agent.
+        :param goal: The goal location of the agent.
+        :param constraints: The current constraints.
+        :param conflictAvoidance: The paths of the other agents to avoid where possible.
+        :param budget: The budget polled as the search runs, None for no limit.
+        :raises SearchStopped: If the budget runs out while searching.
+        :return: Agent path from the start location to the goal location.
+        """
+
+        width = graph.width
+        height = graph.height
+        size = width * height
+        obstacles = graph.obstacles
+
+        startCell = start.location.x * width + start.location.y
+        goalCell = goal.location.x * width + goal.location.y
+        distances = self.getDistances(graph, goalCell, budget)
+        if distances[startCell] == -1:
+            return False
+
+        vertexKeys = constraints.vertexKeys
+        edgeKeys = constraints.edgeKeys
+        landmarks = constraints.landmarks
+        if landmarks.get(0, start.location.key) != start.location.key:
+            return False
+        goalTime = constraints.getGoalTime(goal.location.key)
+        maxTime = constraints.maxTime + 1 + size
+
+        openSet = PriorityQueue()
+        openSet.push(startCell, (max(distances[startCell], goalTime), 0, 0))
+        closedSet = set()
+        cameFrom = {}
+        conflicts = {startCell: 0}
+
+        directions = [(0, 0), (0, 1), (0, -1), (-1, 0), (1, 0)]
+        expanded = 0
+
+        while openSet:
+            currentKey = openSet.pop()
+            time, cell = divmod(currentKey, size)
+
+            if budget is not None:
+                expanded += 1
+                if expanded % self.POLL_INTERVAL == 0:
+                    self.pollBudget(budget)
+
+            if cell == goalCell and time >= goalTime:
+                path = [currentKey]
+                while currentKey in cameFrom:
+                    currentKey = cameFrom[currentKey]
+                    path.append(currentKey)
+                path.reverse()
+                return [State(key // size, Location(*divmod(key % size, width))) for key in path]
+
+            closedSet.add(currentKey)
+
+            nextTime = time + 1
+            x, y = divmod(cell, width)
+            currentLocationKey = packLocation(x, y)
+
+            for dx, dy in directions:
+                nextX = x + dx
+                nextY = y + dy
+                if not (0 <= nextX < height and 0 <= nextY < width):
                     continue
 
-                tentative_g_score = g_score.setdefault(current, float("inf")) + 1
+                nextCell = nextX * width + nextY
+                if obstacles[nextCell]:
+                    continue
 
-                if neighbor not in open_set:
-                    open_set |= {neighbor}
-                elif tentative_g_score >= g_score.setdefault(neighbor, float("inf")):
+                fScore = max(nextTime + distances[nextCell], goalTime)
+                if fScore > maxTime:
                     continue
 
-                came_from[neighbor] = current
+                nextKey = nextTime * size + nextCell
+                if nextKey in closedSet:
+                    continue
 
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = g_score[neighbor] + (
-                            fabs(neighbor.location.x - goal.location.x) + fabs(neighbor.location.y - goal.location.y))
-        return False
+                nextLocationKey = packLocation(nextX, nextY)
+                if vertexKeys and packTimed(nextTime, nextLocationKey) in vertexKeys:
+                    continue
+                if edgeKeys and packEdge(time, currentLocationKey, nextLocationKey) in edgeKeys:
+                    continue
+                if landmarks and landmarks.get(nextTime, nextLocationKey) != nextLocationKey:
+                    continue
+
+                nextConflicts = conflicts[currentKey]
+                if conflictAvoidance is not None:
+                    nextConflicts += conflictAvoidance.getConflicts(time, cell, nextCell)
 
+                if openSet.push(nextKey, (fScore, nextConflicts, -nextTime)):
+                    cameFrom[nextKey] = currentKey
+                    conflicts[nextKey] = nextConflicts
+
+        return False
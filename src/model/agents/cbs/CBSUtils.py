@@ -1,12 +1,54 @@
+def packLocation(x, y):
+    """
+    Packs a pair of coordinates into a single integer key.
+
+    :param x: The x coordinate.
+    :param y: The y coordinate.
+    :return: The integer key of the coordinates.
+    """
+
+    return (x << 32) | (y & 0xFFFFFFFF)
+
+
+def packTimed(time, key):
+    """
+    Packs a time and a location key into a single integer key.
+
+    :param time: The time.
+    :param key: The key of the location.
+    :return: The integer key of the time and location.
+    """
+
+    return (time << 64) | (key & 0xFFFFFFFFFFFFFFFF)
+
+
+def packEdge(time, fromKey, toKey):
+    """
+    Packs a time and a pair of location keys into a single integer key.
+
+    :param time: The time the move starts.
+    :param fromKey: The key of the location the move starts from.
+    :param toKey: The key of the location the move ends at.
+    :return: The integer key of the move.
+    """
+
+    return (packTimed(time, fromKey) << 64) | (toKey & 0xFFFFFFFFFFFFFFFF)
+
+
 class Location:
     """
     A class representing a location.
 
+    Locations are immutable and carry a packed integer key, which is used for hashing and equality.
+
     Methods:
         __init__(self, x, y): Sets the location's coordinates.
         __eq__(self, other): Checks if two locations are equal.
+        __hash__(self): Returns the hash of the location.
     """
 
+    __slots__ = ("x", "y", "key")
+
     def __init__(self, x=-1, y=-1):
         """
         Initializes the location's coordinates.
@@ -17,6 +59,7 @@ class Location:
 
         self.x = x
         self.y = y
+        self.key = packLocation(x, y)
 
     def __eq__(self, other):
         """
@@ -26,7 +69,16 @@ class Location:
         :return: Boolean value indicating if two locations are equal.
         """
 
-        return self.x == other.x and self.y == other.y
+        return self.key == other.key
+
+    def __hash__(self):
+        """
+        Returns the hash of the location.
+
+        :return: The hash of the location.
+        """
+
+        return hash(self.key)
 
 
 class State:
@@ -39,6 +91,8 @@ class State:
         __hash__(self): Returns the hash of the state.
     """
 
+    __slots__ = ("time", "location", "key")
+
     def __init__(self, time, location):
         """
         Initializes the state's time and coordinates.
@@ -49,6 +103,7 @@ class State:
 
         self.time = time
         self.location = location
+        self.key = packTimed(time, location.key)
 
     def __eq__(self, other):
         """
@@ -58,7 +113,7 @@ class State:
         :return: Boolean value indicating if two states are equal.
         """
 
-        return self.time == other.time and self.location == other.location
+        return self.key == other.key
 
     def __hash__(self):
         """
@@ -67,7 +122,7 @@ class State:
         :return: The hash of the state.
         """
 
-        return hash(str(self.time) + str(self.location.x) + str(self.location.y))
+        return hash(self.key)
 
 
 class Conflict:
@@ -78,6 +133,8 @@ class Conflict:
         __init__(self, time, cType, a1, a2, v1, v2): Creates a conflict at a given time and location.
     """
 
+    __slots__ = ("time", "type", "agent_1", "agent_2", "location_1", "location_2")
+
     def __init__(self, time, cType, a1, a2, v1, v2=Location()):
         """
         Creates a conflict at a given time and location.
@@ -109,6 +166,8 @@ class VertexConstraint:
         __hash__(self): Returns the hash of the vertex constraint.
     """
 
+    __slots__ = ("time", "location", "key")
+
     def __init__(self, time, location):
         """
         Initializes the vertex constraint.
@@ -119,6 +178,7 @@ class VertexConstraint:
 
         self.time = time
         self.location = location
+        self.key = packTimed(time, location.key)
 
     def __eq__(self, other):
         """
@@ -128,7 +188,7 @@ class VertexConstraint:
         :return: Boolean value indicating if two vertex constraints are equal.
         """
 
-        return self.time == other.time and self.location == other.location
+        return self.key == other.key
 
     def __hash__(self):
         """
@@ -137,7 +197,7 @@ class VertexConstraint:
         :return: The hash of the vertex constraint.
         """
 
-        return hash(str(self.time) + str((self.location.x, self.location.y)))
+        return hash(self.key)
 
 
 class EdgeConstraint:
@@ -150,6 +210,8 @@ class EdgeConstraint:
         __hash__(self): Returns the hash of the edge constraint.
     """
 
+    __slots__ = ("time", "location_1", "location_2", "key")
+
     def __init__(self, time, location_1, location_2):
         """
         Initializes the edge constraint.
@@ -162,6 +224,7 @@ class EdgeConstraint:
         self.time = time
         self.location_1 = location_1
         self.location_2 = location_2
+        self.key = packEdge(time, location_1.key, location_2.key)
 
     def __eq__(self, other):
         """
@@ -171,9 +234,7 @@ class EdgeConstraint:
         :return: Boolean value indicating if two edge constraints are equal.
         """
 
-        return self.time == other.time \
-            and self.location_1 == other.location_1 \
-            and self.location_2 == other.location_2
+        return self.key == other.key
 
     def __hash__(self):
         """
@@ -182,32 +243,238 @@ class EdgeConstraint:
         :return: The hash of the edge constraint.
         """
 
-        return hash(str(self.time)
-                    + str((self.location_1.x, self.location_1.y))
-                    + str((self.location_2.x, self.location_2.y)))
+        return hash(self.key)
 
 
 class Constraints:
     """
     A class representing a set of constraints.
 
+    Alongside the sets of constraint objects, the constraints are indexed by their packed integer
+    keys so the low-level search can probe a move without building a constraint object, and the
+    latest vertex constraint on each location is recorded so the search knows how long an agent
+    must wait before it can safely stop at its goal.
+
+    Positive constraints are vertex constraints the agent must satisfy rather than avoid: the agent
+    has to be at the location at the given time. A positive edge constraint is stored as positive
+    constraints on both ends of the move. Every other agent is implicitly forbidden from the
+    locations and moves of the positive constraints (see getImplied).
+
+    Attributes:
+        vertex_constraints (set): The set of vertex constraints.
+        edge_constraints (set): The set of edge constraints.
+        positive_constraints (set): The set of positive vertex constraints.
+        vertexKeys (set): The packed keys of the vertex constraints.
+        edgeKeys (set): The packed keys of the edge constraints.
+        landmarks (dict): The location key the agent must be at for each positively constrained time.
+        lastTimes (dict): The latest vertex constraint time of each constrained location key.
+        maxTime (int): The latest time of any constraint, -1 if there are none.
+        implied (Constraints): The constraints implied for other agents, None until computed.
+
     Methods:
-        __init__(self, vertex, edge): Initializes the constraints.
+        __init__(self, vertex, edge, positive): Initializes the constraints.
+        addVertex(self, constraint): Adds a vertex constraint.
+        addEdge(self, constraint): Adds an edge constraint.
+        addPositive(self, constraint): Adds a positive vertex constraint.
+        add(self, other): Adds every constraint of another set of constraints.
+        isVertexConstrained(self, time, locationKey): Checks if a location is constrained at a time.
+        isEdgeConstrained(self, time, fromKey, toKey): Checks if a move is constrained at a time.
+        isSatisfiedBy(self, path): Checks if a path satisfies every constraint.
+        getLastTime(self, locationKey): Returns the latest time a location is constrained.
+        getGoalTime(self, locationKey): Returns the earliest time the agent may stop at its goal.
+        getImplied(self): Returns the constraints implied for every other agent.
+        getKey(self): Returns the packed keys of every constraint.
     """
 
-    def __init__(self, vertex=None, edge=None):
+    def __init__(self, vertex=None, edge=None, positive=None):
         """
         Initializes the constraints.
 
         :param vertex: The set of vertex constraints.
         :param edge: The set of edge constraints.
+        :param positive: The set of positive vertex constraints.
         """
 
         self.vertex_constraints = set()
         self.edge_constraints = set()
+        self.positive_constraints = set()
+
+        self.vertexKeys = set()
+        self.edgeKeys = set()
+        self.landmarks = {}
+        self.lastTimes = {}
+        self.maxTime = -1
+        self.implied = None
 
         if vertex is not None:
-            self.vertex_constraints |= {vertex}
+            self.addVertex(vertex)
 
         if edge is not None:
-            self.edge_constraints |= {edge}
+            self.addEdge(edge)
+
+        if positive is not None:
+            self.addPositive(positive)
+
+    def addVertex(self, constraint):
+        """
+        Adds a vertex constraint.
+
+        :param constraint: The vertex constraint to add.
+        """
+
+        self.vertex_constraints.add(constraint)
+        self.vertexKeys.add(constraint.key)
+
+        locationKey = constraint.location.key
+        if constraint.time > self.lastTimes.get(locationKey, -1):
+            self.lastTimes[locationKey] = constraint.time
+        if constraint.time > self.maxTime:
+            self.maxTime = constraint.time
+
+    def addEdge(self, constraint):
+        """
+        Adds an edge constraint.
+
+        :param constraint: The edge constraint to add.
+        """
+
+        self.edge_constraints.add(constraint)
+        self.edgeKeys.add(constraint.key)
+
+        if constraint.time + 1 > self.maxTime:
+            self.maxTime = constraint.time + 1
+
+    def addPositive(self, constraint):
+        """
+        Adds a positive vertex constraint.
+
+        If another location is already required at the same time, the landmark is replaced by an
+        unreachable location so that no path can satisfy both.
+
+        :param constraint: The positive vertex constraint to add.
+        """
+
+        self.positive_constraints.add(constraint)
+        self.implied = None
+
+        landmark = self.landmarks.get(constraint.time)
+        if landmark is None or landmark == constraint.location.key:
+            self.landmarks[constraint.time] = constraint.location.key
+        else:
+            self.landmarks[constraint.time] = Location().key
+        if constraint.time > self.maxTime:
+            self.maxTime = constraint.time
+
+    def add(self, other):
+        """
+        Adds every constraint of another set of constraints.
+
+        :param other: The constraints to add.
+        """
+
+        for constraint in other.vertex_constraints:
+            self.addVertex(constraint)
+        for constraint in other.edge_constraints:
+            self.addEdge(constraint)
+        for constraint in other.positive_constraints:
+            self.addPositive(constraint)
+
+    def isVertexConstrained(self, time, locationKey):
+        """
+        Checks if a location is constrained at a time.
+
+        :param time: The time to check.
+        :param locationKey: The packed key of the location.
+        :return: Boolean value indicating if the location is forbidden, or another location is required.
+        """
+
+        if packTimed(time, locationKey) in self.vertexKeys:
+            return True
+        landmark = self.landmarks.get(time)
+        return landmark is not None and landmark != locationKey
+
+    def isEdgeConstrained(self, time, fromKey, toKey):
+        """
+        Checks if a move is constrained at a time.
+
+        :param time: The time the move starts.
+        :param fromKey: The packed key of the location the move starts from.
+        :param toKey: The packed key of the location the move ends at.
+        :return: Boolean value indicating if the move is constrained.
+        """
+
+        return packEdge(time, fromKey, toKey) in self.edgeKeys
+
+    def isSatisfiedBy(self, path):
+        """
+        Checks if a path satisfies every constraint.
+
+        :param path: The path of states to check, the agent waits at the last state afterwards.
+        :return: Boolean value indicating if the path satisfies every constraint.
+        """
+
+        last = len(path) - 1
+        for time in range(max(last, self.maxTime) + 1):
+            locationKey = path[time if time < last else last].location.key
+            if self.isVertexConstrained(time, locationKey):
+                return False
+            if time < last and self.isEdgeConstrained(time, locationKey, path[time + 1].location.key):
+                return False
+        return True
+
+    def getLastTime(self, locationKey):
+        """
+        Returns the latest time a location is constrained.
+
+        :param locationKey: The packed key of the location.
+        :return: The latest vertex constraint time on the location, -1 if it is never constrained.
+        """
+
+        return self.lastTimes.get(locationKey, -1)
+
+    def getGoalTime(self, locationKey):
+        """
+        Returns the earliest time the agent may stop at its goal.
+
+        The agent must wait out every vertex constraint on its goal and reach every positive
+        constraint away from its goal before it can stop.
+
+        :param locationKey: The packed key of the goal location.
+        :return: The earliest time at which the agent may stay at its goal.
+        """
+
+        goalTime = self.getLastTime(locationKey) + 1
+        for time, landmark in self.landmarks.items():
+            if landmark != locationKey and time > goalTime:
+                goalTime = time
+        return goalTime
+
+    def getImplied(self):
+        """
+        Returns the constraints implied for every other agent.
+
+        Other agents may not occupy a positively constrained location at its time, nor traverse a
+        positively constrained move in the opposite direction.
+
+        :return: The negative constraints implied by the positive constraints.
+        """
+
+        if self.implied is None:
+            self.implied = Constraints()
+            for constraint in self.positive_constraints:
+                self.implied.addVertex(VertexConstraint(constraint.time, constraint.location))
+            for constraint in self.positive_constraints:
+                for following in self.positive_constraints:
+                    if following.time == constraint.time + 1 and following.location != constraint.location:
+                        self.implied.addEdge(EdgeConstraint(constraint.time, following.location, constraint.location))
+        return self.implied
+
+    def getKey(self):
+        """
+        Returns the packed keys of every constraint.
+
+        :return: Frozen set of (constraint type, constraint key) entries.
+        """
+
+        return frozenset([(1, key) for key in self.vertexKeys] + [(2, key) for key in self.edgeKeys]
+                         + [(3, constraint.key) for constraint in self.positive_constraints])
@@ -0,0 +1,80 @@
+class ConflictAvoidanceTable:
+    """
+    A class representing the paths of other agents, used to steer a low-level search away from them.
+
+    Locations and moves are stored as packed cell keys (time * cells + cell), counting how many
+    paths use each, so the number of conflicts a move would cause can be looked up in O(1).
+    Agents that have reached the end of their path are treated as waiting at their goal.
+
+    Attributes:
+        width (int): The width of the graph/maze.
+        size (int): The number of cells in the graph/maze.
+        vertices (dict): The number of paths at each (time, cell) key.
+        edges (dict): The number of paths making each (time, from cell, to cell) move.
+        goals (dict): The times at which paths come to rest at each cell.
+
+    Methods:
+        __init__(self, graph, paths): Initializes the table from a given set of paths.
+        addPath(self, path): Adds a path to the table.
+        getConflicts(self, time, fromCell, toCell): Counts the conflicts caused by a move.
+    """
+
+    __slots__ = ("width", "size", "vertices", "edges", "goals")
+
+    def __init__(self, graph, paths=()):
+        """
+        Initializes the table from a given set of paths.
+
+        :param graph: The graph/maze the paths traverse.
+        :param paths: The paths of the other agents.
+        """
+
+        self.width = graph.width
+        self.size = graph.width * graph.height
+        self.vertices = {}
+        self.edges = {}
+        self.goals = {}
+
+        for path in paths:
+            self.addPath(path)
+
+    def addPath(self, path):
+        """
+        Adds a path to the table.
+
+        :param path: The path to add.
+        """
+
+        width = self.width
+        size = self.size
+        vertices = self.vertices
+        edges = self.edges
+
+        cells = [state.location.x * width + state.location.y for state in path]
+        last = len(cells) - 1
+        for t in range(last):
+            key = t * size + cells[t]
+            vertices[key] = vertices.get(key, 0) + 1
+            if cells[t] != cells[t + 1]:
+                key = (t * size + cells[t]) * size + cells[t + 1]
+                edges[key] = edges.get(key, 0) + 1
+        self.goals.setdefault(cells[last], []).append(last)
+
+    def getConflicts(self, time, fromCell, toCell):
+        """
+        Counts the conflicts caused by a move.
+
+        :param time: The time the move starts.
+        :param fromCell: The cell the move starts from.
+        :param toCell: The cell the move ends at.
+        :return: The number of paths the move conflicts with.
+        """
+
+        size = self.size
+        conflicts = self.vertices.get((time + 1) * size + toCell, 0)
+        if fromCell != toCell:
+            conflicts += self.edges.get((time * size + toCell) * size + fromCell, 0)
+        arrivals = self.goals.get(toCell)
+        if arrivals:
+            conflicts += sum([1 for arrival in arrivals if arrival <= time + 1])
+        return conflicts
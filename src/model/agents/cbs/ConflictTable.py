@@ -0,0 +1,174 @@
+from src.model.agents.cbs.CBSUtils import Conflict
+
+
+class ConflictTable:
+    """
+    A class representing the conflicts between the paths of a solution.
+
+    Conflicts are stored per pair of agents, so when a single agent is replanned only the pairs
+    involving that agent are recomputed and every other pair is shared with the previous table.
+    Agents that have reached the end of their path are treated as waiting at their goal, and a pair
+    is only checked until the later of the two agents has finished.
+
+    Attributes:
+        order (dict): The position of each agent in the solution, used to order pairs of agents.
+        pairs (dict): The conflicts in time order of each (agentOne, agentTwo) pair that conflicts.
+        count (int): The total number of conflicts in the table.
+
+    Methods:
+        __init__(self, order, pairs): Initializes the conflict table.
+        __len__(self): Returns the number of conflicts in the table.
+        fromSolution(solution): Creates the conflict table of a solution.
+        update(self, solution, agent): Creates the conflict table after an agent has been replanned.
+        getFirst(self): Returns the earliest conflict in the table.
+        getConflicts(self): Returns every conflict in the table.
+        getPairConflicts(agentOne, pathOne, agentTwo, pathTwo): Returns the conflicts between two paths.
+    """
+
+    __slots__ = ("order", "pairs", "count")
+
+    def __init__(self, order, pairs=None):
+        """
+        Initializes the conflict table.
+
+        :param order: The position of each agent in the solution.
+        :param pairs: The conflicts of each pair of agents.
+        """
+
+        self.order = order
+        self.pairs = pairs if pairs is not None else {}
+        self.count = sum([len(conflicts) for conflicts in self.pairs.values()])
+
+    def __len__(self):
+        """
+        Returns the number of conflicts in the table.
+
+        :return: The number of conflicts in the table.
+        """
+
+        return self.count
+
+    @staticmethod
+    def fromSolution(solution):
+        """
+        Creates the conflict table of a solution.
+
+        At each timestep the location and move of every agent are hashed, so a vertex conflict is a
+        location that is already occupied and an edge conflict is a move whose reverse was already
+        made. This finds every conflict in O(T * A) rather than comparing every pair of agents.
+
+        :param solution: The path of each agent.
+        :return: The conflict table of the solution.
+        """
+
+        order = {agent: index for index, agent in enumerate(solution.keys())}
+        pairs = {}
+
+        maxTime = max([len(path) for path in solution.values()], default=0)
+        for t in range(maxTime):
+            occupied = {}
+            moves = {}
+            for agent, path in solution.items():
+                last = len(path) - 1
+                here = path[t if t < last else last].location
+                there = path[t + 1 if t + 1 < last else last].location
+
+                others = occupied.get(here.key)
+                if others is None:
+                    occupied[here.key] = [(agent, last)]
+                else:
+                    for other, otherLast in others:
+                        if t <= last or t <= otherLast:
+                            pairs.setdefault((other, agent), []).append(Conflict(t, 1, other, agent, here))
+                    others.append((agent, last))
+
+                if here.key != there.key:
+                    for other in moves.get((there.key, here.key), ()):
+                        pairs.setdefault((other, agent), []).append(Conflict(t, 2, other, agent, there, here))
+                    moves.setdefault((here.key, there.key), []).append(agent)
+
+        return ConflictTable(order, pairs)
+
+    def update(self, solution, agent):
+        """
+        Creates the conflict table after an agent has been replanned.
+
+        :param solution: The path of each agent, including the replanned path.
+        :param agent: The agent that has been replanned.
+        :return: The new conflict table, this table is left unchanged.
+        """
+
+        pairs = {pair: conflicts for pair, conflicts in self.pairs.items() if agent not in pair}
+
+        path = solution[agent]
+        for other, otherPath in solution.items():
+            if other == agent:
+                continue
+            if self.order[other] < self.order[agent]:
+                conflicts = self.getPairConflicts(other, otherPath, agent, path)
+                if conflicts:
+                    pairs[(other, agent)] = conflicts
+            else:
+                conflicts = self.getPairConflicts(agent, path, other, otherPath)
+                if conflicts:
+                    pairs[(agent, other)] = conflicts
+
+        return ConflictTable(self.order, pairs)
+
+    def getFirst(self):
+        """
+        Returns the earliest conflict in the table.
+
+        Conflicts at the same time are ordered by the position of their agents in the solution.
+
+        :return: The earliest conflict, False if there are no conflicts.
+        """
+
+        first = False
+        firstKey = None
+        for (agentOne, agentTwo), conflicts in self.pairs.items():
+            key = (conflicts[0].time, self.order[agentOne], self.order[agentTwo])
+            if firstKey is None or key < firstKey:
+                first = conflicts[0]
+                firstKey = key
+        return first
+
+    def getConflicts(self):
+        """
+        Returns every conflict in the table.
+
+        :return: List of every conflict in the table.
+        """
+
+        return [conflict for conflicts in self.pairs.values() for conflict in conflicts]
+
+    @staticmethod
+    def getPairConflicts(agentOne, pathOne, agentTwo, pathTwo):
+        """
+        Returns the conflicts between two paths.
+
+        :param agentOne: The first agent.
+        :param pathOne: The path of the first agent.
+        :param agentTwo: The second agent.
+        :param pathTwo: The path of the second agent.
+        :return: The conflicts between the two paths in time order.
+        """
+
+        conflicts = []
+        lastOne = len(pathOne) - 1
+        lastTwo = len(pathTwo) - 1
+        for t in range(max(lastOne, lastTwo) + 1):
+            locationOneA = pathOne[t if t < lastOne else lastOne].location
+            locationTwoA = pathTwo[t if t < lastTwo else lastTwo].location
+
+            if locationOneA.key == locationTwoA.key:
+                conflicts.append(Conflict(t, 1, agentOne, agentTwo, locationOneA))
+                continue
+
+            locationOneB = pathOne[t + 1 if t + 1 < lastOne else lastOne].location
+            locationTwoB = pathTwo[t + 1 if t + 1 < lastTwo else lastTwo].location
+
+            if locationOneA.key == locationTwoB.key and locationOneB.key == locationTwoA.key:
+                conflicts.append(Conflict(t, 2, agentOne, agentTwo, locationOneA, locationOneB))
+
+        return conflicts
@@ -0,0 +1,167 @@
+from src.model.agents.FocalList import FocalList
+from src.model.agents.cbs.CBS import CBS
+from src.model.agents.cbs.CBSUtils import *
+
+
+class ECBS(CBS):
+    """
+    Class implementing the Enhanced Conflict-Based Search algorithm.
+
+    ECBS trades optimality for speed with a suboptimality factor w. The low-level search is a focal
+    search that returns the path with the fewest conflicts with the other agents among the paths
+    costing at most w times a lower bound on the agent's optimal cost. The high-level search keeps
+    the sum of these bounds for each constraint tree node, and expands the node with the fewest
+    conflicts among the nodes costing at most w times the lowest bound. The returned solution
+    therefore costs at most w times the optimal cost.
+
+    Attributes:
+        suboptimality (float): The factor the cost of a solution may exceed the optimal cost by.
+
+    Methods:
+        __init__(self, suboptimality, prioritiseConflicts, bypassConflicts, disjointSplitting): Initializes ECBS.
+        planPath(self, graph, waypoint, constraints, conflictAvoidance, budget): Plans the path of a single agent.
+        focalSearchWithConstraints(self, graph, start, goal, constraints, conflictAvoidance, budget): Performs focal
+            search.
+    """
+
+    def __init__(self, suboptimality=1.5, prioritiseConflicts=False, bypassConflicts=False, disjointSplitting=False):
+        """
+        Initializes the Enhanced Conflict-Based Search algorithm.
+
+        :param suboptimality: The factor the cost of a solution may exceed the optimal cost by, at least 1.
+        :param prioritiseConflicts: Whether to split on cardinal conflicts first.
+        :param bypassConflicts: Whether to adopt a child's path into its parent instead of branching.
+        :param disjointSplitting: Whether to split conflicts into a negative and a positive constraint.
+        """
+
+        if suboptimality < 1:
+            raise ValueError("suboptimality must be at least 1")
+
+        super().__init__(prioritiseConflicts, bypassConflicts, disjointSplitting)
+        self.suboptimality = suboptimality
+
+    def planPath(self, graph, waypoint, constraints, conflictAvoidance, budget=None):
+        """
+        Plans the path of a single agent with the focal low-level search.
+
+        :param graph: The graph to traverse.
+        :param waypoint: The start and goal of the agent.
+        :param constraints: The constraints of the agent.
+        :param conflictAvoidance: The paths of the other agents to avoid where possible.
+        :param budget: The budget polled by the low-level search, None for no limit.
+        :raises SearchStopped: If the budget runs out while planning.
+        :return: Tuple of the path, False if there is none, and a lower bound on its cost.
+        """
+
+        return self.focalSearchWithConstraints(graph, waypoint['start'], waypoint['goal'], constraints,
+                                               conflictAvoidance, budget)
+
+    def focalSearchWithConstraints(self, graph, start, goal, constraints, conflictAvoidance, budget=None):
+        """
+        Performs focal search with constraints.
+
+        The search runs over the same packed (time, location) states as A* with constraints, but
+        expands the state with the fewest conflicts among the states whose f-score is within the
+        suboptimality factor of the lowest f-score. A state is requeued whenever a parent with
+        fewer conflicts is found. The lowest f-score when the goal is reached is a lower bound on
+        the cost of the agent's optimal path. The budget is polled every POLL_INTERVAL expansions.
+
+        :param graph: The graph to traverse.
+        :param start: The start location of the agent.
+        :param goal: The goal location of the agent.
+        :param constraints: The current constraints.
+        :param conflictAvoidance: The paths of the other agents to avoid where possible.
+        :param budget: The budget polled as the search runs, None for no limit.
+        :raises SearchStopped: If the budget runs out while searching.
+        :return: Tuple of the agent path, False if there is none, and a lower bound on its cost.
+        """
+
+        width = graph.width
+        height = graph.height
+        size = width * height
+        obstacles = graph.obstacles
+
+        startCell = start.location.x * width + start.location.y
+        goalCell = goal.location.x * width + goal.location.y
+        distances = self.getDistances(graph, goalCell, budget)
+        if distances[startCell] == -1:
+            return False, 0
+
+        vertexKeys = constraints.vertexKeys
+        edgeKeys = constraints.edgeKeys
+        landmarks = constraints.landmarks
+        if landmarks.get(0, start.location.key) != start.location.key:
+            return False, 0
+        goalTime = constraints.getGoalTime(goal.location.key)
+        maxTime = constraints.maxTime + 1 + size
+
+        openSet = FocalList(self.suboptimality)
+        startScore = max(distances[startCell], goalTime)
+        openSet.push(startCell, startScore, startScore, (0, startScore, 0))
+        closedSet = set()
+        cameFrom = {}
+        conflicts = {startCell: 0}
+
+        directions = [(0, 0), (0, 1), (0, -1), (-1, 0), (1, 0)]
+        expanded = 0
+
+        while openSet:
+            lowerBound = openSet.getLowerBound()
+            currentKey = openSet.pop()
+            if currentKey in closedSet:
+                continue
+            time, cell = divmod(currentKey, size)
+
+            if budget is not None:
+                expanded += 1
+                if expanded % self.POLL_INTERVAL == 0:
+                    self.pollBudget(budget)
+
+            if cell == goalCell and time >= goalTime:
+                path = [currentKey]
+                while currentKey in cameFrom:
+                    currentKey = cameFrom[currentKey]
+                    path.append(currentKey)
+                path.reverse()
+                return [State(key // size, Location(*divmod(key % size, width))) for key in path], lowerBound + 1
+
+            closedSet.add(currentKey)
+
+            nextTime = time + 1
+            x, y = divmod(cell, width)
+            currentLocationKey = packLocation(x, y)
+
+            for dx, dy in directions:
+                nextX = x + dx
+                nextY = y + dy
+                if not (0 <= nextX < height and 0 <= nextY < width):
+                    continue
+
+                nextCell = nextX * width + nextY
+                if obstacles[nextCell]:
+                    continue
+
+                fScore = max(nextTime + distances[nextCell], goalTime)
+                if fScore > maxTime:
+                    continue
+
+                nextKey = nextTime * size + nextCell
+                if nextKey in closedSet:
+                    continue
+
+                nextLocationKey = packLocation(nextX, nextY)
+                if vertexKeys and packTimed(nextTime, nextLocationKey) in vertexKeys:
+                    continue
+                if edgeKeys and packEdge(time, currentLocationKey, nextLocationKey) in edgeKeys:
+                    continue
+                if landmarks and landmarks.get(nextTime, nextLocationKey) != nextLocationKey:
+                    continue
+
+                nextConflicts = conflicts[currentKey] + conflictAvoidance.getConflicts(time, cell, nextCell)
+                best = conflicts.get(nextKey)
+                if best is None or nextConflicts < best:
+                    cameFrom[nextKey] = currentKey
+                    conflicts[nextKey] = nextConflicts
+                    openSet.push(nextKey, fScore, fScore, (nextConflicts, fScore, -nextTime))
+
+        return False, 0
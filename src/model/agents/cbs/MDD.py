@@ -0,0 +1,110 @@
+from src.model.agents.cbs.CBSUtils import packLocation
+
+
+class MDD:
+    """
+    A class representing a multi-valued decision diagram of an agent's optimal paths.
+
+    The diagram holds, for every timestep up to the cost of the agent's path, the set of cells the
+    agent could occupy on some path of exactly that cost that satisfies its constraints. A level
+    containing a single cell means every optimal path passes through that cell at that time.
+
+    Attributes:
+        depth (int): The time at which the paths reach the goal.
+        goal (int): The goal cell of the agent.
+        levels (list): The cells of each level of the diagram.
+
+    Methods:
+        __init__(self, graph, start, goal, cost, constraints): Builds the diagram of an agent.
+        getLevel(self, time): Returns the cells the agent may occupy at a given time.
+        isSingleton(self, time, cell): Checks if every path occupies a cell at a given time.
+    """
+
+    __slots__ = ("depth", "goal", "levels")
+
+    def __init__(self, graph, start, goal, cost, constraints):
+        """
+        Builds the diagram of an agent.
+
+        Cells are expanded forwards from the start while they can still reach the goal in time,
+        then every cell that does not lead to the goal at the final level is pruned backwards.
+
+        :param graph: The graph to traverse.
+        :param start: The start state of the agent.
+        :param goal: The goal state of the agent.
+        :param cost: The number of states in the agent's optimal path.
+        :param constraints: The constraints of the agent.
+        """
+
+        width = graph.width
+        height = graph.height
+        obstacles = graph.obstacles
+
+        startCell = start.location.x * width + start.location.y
+        goalCell = goal.location.x * width + goal.location.y
+        distances = graph.getDistances(goalCell)
+
+        self.depth = cost - 1
+        self.goal = goalCell
+
+        directions = [(0, 0), (0, 1), (0, -1), (-1, 0), (1, 0)]
+
+        forward = [{startCell}]
+        successors = []
+        for time in range(self.depth):
+            remaining = self.depth - time - 1
+            level = set()
+            edges = {}
+            for cell in forward[time]:
+                x, y = divmod(cell, width)
+                locationKey = packLocation(x, y)
+                nextCells = []
+                for dx, dy in directions:
+                    nextX = x + dx
+                    nextY = y + dy
+                    if not (0 <= nextX < height and 0 <= nextY < width):
+                        continue
+                    nextCell = nextX * width + nextY
+                    if obstacles[nextCell] or not 0 <= distances[nextCell] <= remaining:
+                        continue
+                    nextLocationKey = packLocation(nextX, nextY)
+                    if constraints.isVertexConstrained(time + 1, nextLocationKey) \
+                            or constraints.isEdgeConstrained(time, locationKey, nextLocationKey):
+                        continue
+                    nextCells.append(nextCell)
+                    level.add(nextCell)
+                edges[cell] = nextCells
+            forward.append(level)
+            successors.append(edges)
+
+        self.levels = [set() for _ in forward]
+        if goalCell in forward[self.depth]:
+            self.levels[self.depth].add(goalCell)
+        for time in range(self.depth - 1, -1, -1):
+            nextLevel = self.levels[time + 1]
+            self.levels[time] = {cell for cell in forward[time]
+                                 if any([nextCell in nextLevel for nextCell in successors[time][cell]])}
+
+    def getLevel(self, time):
+        """
+        Returns the cells the agent may occupy at a given time.
+
+        :param time: The time of the level.
+        :return: The set of cells of the level, the goal once the agent has arrived.
+        """
+
+        if time >= self.depth:
+            return {self.goal}
+        return self.levels[time]
+
+    def isSingleton(self, time, cell):
+        """
+        Checks if every path occupies a cell at a given time.
+
+        :param time: The time to check.
+        :param cell: The cell to check.
+        :return: Boolean value indicating if the level at the given time only holds the given cell.
+        """
+
+        level = self.getLevel(time)
+        return len(level) == 1 and cell in level
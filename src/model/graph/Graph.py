@@ -1,19 +1,97 @@
+from array import array
+from itertools import compress
+
 from src.model.graph.Node import Node
 
 
+class NodeView:
+    """
+    A read-only mapping from node indices to nodes of an array-backed graph.
+
+    Methods:
+        __init__(self, graph): Initializes the view over a given graph.
+        __getitem__(self, index): Returns the node at a given index.
+        __len__(self): Returns the number of nodes in the graph.
+        __iter__(self): Iterates over the node indices of the graph.
+        __contains__(self, index): Checks if an index belongs to the graph.
+    """
+
+    __slots__ = ("graph",)
+
+    def __init__(self, graph):
+        """
+        Initializes the view over a given graph.
+
+        :param graph: The graph to view.
+        """
+
+        self.graph = graph
+
+    def __getitem__(self, index: int) -> Node:
+        """
+        Returns the node at a given index.
+
+        :param index: The index of the node.
+        :return: The node at the given index.
+        """
+
+        if not 0 <= index < len(self.graph.obstacles):
+            raise KeyError(index)
+        return Node(self.graph, index)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of nodes in the graph.
+
+        :return: The number of nodes in the graph.
+        """
+
+        return len(self.graph.obstacles)
+
+    def __iter__(self):
+        """
+        Iterates over the node indices of the graph.
+
+        :return: An iterator over the node indices.
+        """
+
+        return iter(range(len(self.graph.obstacles)))
+
+    def __contains__(self, index) -> bool:
+        """
+        Checks if an index belongs to the graph.
+
+        :param index: The index to check.
+        :return: Boolean value indicating if the index belongs to the graph.
+        """
+
+        return isinstance(index, int) and 0 <= index < len(self.graph.obstacles)
+
+
 class Graph:
     """
     A class for representing a graph/maze data-structure.
 
+    The maze is stored as a flat occupancy array indexed by (y * width + x) rather than as one object
+    per cell, and neighbours are computed on the fly. Searches keep their own scratch state (see
+    SearchState), so the graph is never written to by a search and can be shared between searches.
+
     Attributes:
         width (int): The width of the graph/maze.
         height (int): The height of the graph/maze.
-        nodes (list): The list of nodes in the graph/maze.
+        nodes (NodeView): The mapping from node indices to nodes in the graph/maze.
+        obstacles (bytearray): The occupancy of each node, 1 for an obstacle and 0 for an open space.
+        distanceCache (dict): The distance tables computed for each goal node, cleared on any change.
 
     Methods:
         __init__(self): Initializes the graph/maze object.
         create(self, w, h): Creates a new graph/maze of size (width * height).
-        reset(self): Resets each node in the graph/maze back to its original state.
+        isObstacle(self, index): Checks if a given node is an obstacle.
+        setObstacle(self, index, obstacle): Sets whether a given node is an obstacle.
+        setObstacles(self, occupancy): Sets the occupancy of every node at once.
+        toggleObstacle(self, index): Toggles a given node between an obstacle and an open space.
+        getNeighbours(self, index): Returns the indices of the nodes neighbouring a given node.
+        getDistances(self, goal, poll): Returns the true distance from every node to a given goal node.
         heuristic(self, a, b): Returns the manhattan heuristic from a to b.
         getDimensions(): Returns the dimensions of the graph/maze.
         getObstacles(): Returns the obstacles of the graph/maze.
@@ -26,7 +104,9 @@ class Graph:
 
         self.width = 0
         self.height = 0
-        self.nodes = {}
+        self.nodes = NodeView(self)
+        self.obstacles = bytearray()
+        self.distanceCache = {}
 
     def create(self, width: int, height: int):
         """
@@ -38,34 +118,109 @@ class Graph:
 
         self.width = width
         self.height = height
-        self.nodes = {}
+        self.obstacles = bytearray(width * height)
+        self.distanceCache = {}
+
+    def isObstacle(self, index: int) -> bool:
+        """
+        Checks if a given node is an obstacle.
+
+        :param index: The id of the node.
+        :return: Boolean value indicating if the node is an obstacle.
+        """
+
+        return self.obstacles[index] == 1
+
+    def setObstacle(self, index: int, obstacle: bool):
+        """
+        Sets whether a given node is an obstacle.
+
+        :param index: The id of the node.
+        :param obstacle: Whether the node should be an obstacle.
+        """
+
+        self.distanceCache = {}
+        self.obstacles[index] = 1 if obstacle else 0
+
+    def setObstacles(self, occupancy):
+        """
+        Sets the occupancy of every node at once, which is much faster than setting each obstacle in turn.
 
-        for y in range(self.height):
-            for x in range(self.width):
-                self.nodes[y * self.width + x] = Node(x, y)
+        :param occupancy: Bytes-like object holding 1 for each obstacle and 0 for each open space, indexed by node id.
+        """
+
+        if len(occupancy) != self.width * self.height:
+            raise ValueError(f"occupancy has {len(occupancy)} nodes, expected {self.width * self.height}")
 
-        for y in range(self.height):
-            for x in range(self.width):
-                if y > 0:
-                    self.nodes[y * self.width + x].neighbours.append((y - 1) * self.width + x)
-                if y < self.height - 1:
-                    self.nodes[y * self.width + x].neighbours.append((y + 1) * self.width + x)
-                if x > 0:
-                    self.nodes[y * self.width + x].neighbours.append(y * self.width + (x - 1))
-                if x < self.width - 1:
-                    self.nodes[y * self.width + x].neighbours.append(y * self.width + (x + 1))
+        self.obstacles = bytearray(occupancy)
+        self.distanceCache = {}
+
+    def toggleObstacle(self, index: int):
+        """
+        Toggles a given node between an obstacle and an open space.
 
-    def reset(self):
+        :param index: The id of the node.
         """
-        Resets each node in the graph/maze back to its original state.
+
+        self.setObstacle(index, not self.obstacles[index])
+
+    def getNeighbours(self, index: int) -> list:
         """
+        Returns the indices of the nodes neighbouring a given node.
 
-        for y in range(self.height):
-            for x in range(self.width):
-                self.nodes[y * self.width + x].gScore = 0
-                self.nodes[y * self.width + x].fScore = 0
-                self.nodes[y * self.width + x].visited = False
-                self.nodes[y * self.width + x].parent = None
+        :param index: The id of the node.
+        :return: The ids of the neighbouring nodes (up, down, left, right).
+        """
+
+        y, x = divmod(index, self.width)
+        neighbours = []
+        if y > 0:
+            neighbours.append(index - self.width)
+        if y < self.height - 1:
+            neighbours.append(index + self.width)
+        if x > 0:
+            neighbours.append(index - 1)
+        if x < self.width - 1:
+            neighbours.append(index + 1)
+        return neighbours
+
+    def getDistances(self, goal: int, poll=None) -> array:
+        """
+        Returns the true distance from every node to a given goal node.
+
+        The table is built with a breadth-first search from the goal and cached until the obstacles
+        of the graph/maze change. On large mazes building a table takes a noticeable time, so the
+        search asking for it may pass a callable that is called once per level of the breadth-first
+        search, and raises to abandon the table.
+
+        :param goal: The id of the goal node.
+        :param poll: Called with no arguments once per level of the breadth-first search, None to never call it.
+        :return: The distance of each node to the goal, -1 for nodes that cannot reach it.
+        """
+
+        distances = self.distanceCache.get(goal)
+        if distances is not None:
+            return distances
+
+        distances = array('i', [-1]) * (self.width * self.height)
+        if not self.obstacles[goal]:
+            distances[goal] = 0
+            frontier = [goal]
+            distance = 0
+            while frontier:
+                if poll is not None:
+                    poll()
+                distance += 1
+                nextFrontier = []
+                for index in frontier:
+                    for neighbour in self.getNeighbours(index):
+                        if distances[neighbour] == -1 and not self.obstacles[neighbour]:
+                            distances[neighbour] = distance
+                            nextFrontier.append(neighbour)
+                frontier = nextFrontier
+
+        self.distanceCache[goal] = distances
+        return distances
 
     def heuristic(self, a: int, b: int) -> int:
         """
@@ -76,7 +231,9 @@ class Graph:
         :return: The manhattan heuristic between a and b.
         """
 
-        return abs(self.nodes[a].xPos - self.nodes[b].xPos) + abs(self.nodes[a].yPos - self.nodes[b].yPos)
+        ay, ax = divmod(a, self.width)
+        by, bx = divmod(b, self.width)
+        return abs(ax - bx) + abs(ay - by)
 
     def getDimensions(self) -> list:
         """
@@ -92,12 +249,4 @@ class Graph:
         :return: The obstacles of the graph/maze.
         """
 
-        obstacles = []
-
-        for y in range(self.height):
-            for x in range(self.width):
-                node = self.nodes[y * self.width + x]
-                if node.obstacle:
-                    obstacles.append((node.yPos, node.xPos))
-
-        return obstacles
+        return [divmod(index, self.width) for index in compress(range(len(self.obstacles)), self.obstacles)]
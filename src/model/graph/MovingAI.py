@@ -0,0 +1,119 @@
+from src.model.agents.cbs.CBSUtils import State, Location
+from src.model.graph.Graph import Graph
+
+
+class MovingAI:
+    """
+    A class for reading the MovingAI benchmark formats.
+
+    A .map file holds a header giving the height and width of the map, followed by a line per row
+    with a character per cell. The cells ".", "G" and "S" are open spaces and every other cell,
+    such as "@", "O", "T" and "W", is an obstacle. The rows are translated to an occupancy grid in
+    bulk rather than cell by cell, so maps with millions of cells load in well under a second.
+
+    A .scen file holds a line per problem, giving its bucket, map, map width and height, start
+    column and row, goal column and row, and optimal length. Problems are converted to (row,
+    column) pairs, the convention of the rest of the model.
+
+    Attributes:
+        OCCUPANCY (bytes): Translation table from map characters to 1 for obstacles and 0 for open spaces.
+
+    Methods:
+        loadMap(file): Reads a graph/maze from a .map file.
+        loadScenario(file): Reads the problems of a .scen file.
+        getAgents(problems, agents, buckets): Returns the start and goal of each agent for some problems.
+        getWaypoints(problems, agents, buckets): Returns the waypoints of each agent for some problems.
+    """
+
+    OCCUPANCY = bytes(0 if character in b".GS" else 1 for character in range(256))
+
+    @staticmethod
+    def loadMap(file) -> Graph:
+        """
+        Reads a graph/maze from a .map file.
+
+        :param file: The open file to read.
+        :return: The graph/maze of the map.
+        """
+
+        header = {}
+        for line in file:
+            line = line.strip()
+            if line.lower() == "map":
+                break
+            if line:
+                key, value = line.split(None, 1)
+                header[key.lower()] = value
+        else:
+            raise ValueError("map file has no map section")
+
+        width = int(header["width"])
+        height = int(header["height"])
+        rows = file.read().split()
+        if len(rows) != height or any(len(row) != width for row in rows):
+            raise ValueError(f"map section is not {height} rows of {width} cells")
+
+        graph = Graph()
+        graph.create(width, height)
+        graph.setObstacles("".join(rows).encode("ascii", "replace").translate(MovingAI.OCCUPANCY))
+        return graph
+
+    @staticmethod
+    def loadScenario(file) -> list:
+        """
+        Reads the problems of a .scen file.
+
+        :param file: The open file to read.
+        :return: List of problem dictionaries holding the bucket, map, width, height, start, goal and optimal length.
+        """
+
+        problems = []
+        for line in file:
+            if not line.strip() or line.startswith("version"):
+                continue
+
+            fields = line.rstrip("\r\n").split("\t") if "\t" in line else line.split()
+            if len(fields) != 9:
+                raise ValueError(f"scenario line has {len(fields)} fields, expected 9: {line!r}")
+
+            bucket, mapName, width, height, startX, startY, goalX, goalY, optimalLength = fields
+            problems.append({"bucket": int(bucket), "map": mapName, "width": int(width), "height": int(height),
+                             "start": [int(startY), int(startX)], "goal": [int(goalY), int(goalX)],
+                             "optimalLength": float(optimalLength)})
+        return problems
+
+    @staticmethod
+    def getAgents(problems: list, agents: int = None, buckets=None) -> dict:
+        """
+        Returns the start and goal of each agent for some problems, in the format read by Solver and Batch.
+
+        :param problems: The problems of a scenario.
+        :param agents: The number of agents, taken from the first problems, None for every problem.
+        :param buckets: The buckets to take problems from, None for every bucket.
+        :return: Dictionary of each agent's {"start": [row, column], "goal": [row, column]}.
+        """
+
+        if buckets is not None:
+            buckets = set(buckets)
+            problems = [problem for problem in problems if problem["bucket"] in buckets]
+        if agents is not None:
+            if agents > len(problems):
+                raise ValueError(f"scenario has {len(problems)} problems, {agents} agents requested")
+            problems = problems[:agents]
+
+        return {f"agent{agent + 1}": {"start": problem["start"], "goal": problem["goal"]}
+                for agent, problem in enumerate(problems)}
+
+    @staticmethod
+    def getWaypoints(problems: list, agents: int = None, buckets=None) -> dict:
+        """
+        Returns the waypoints of each agent for some problems, in the format read by CBS.
+
+        :param problems: The problems of a scenario.
+        :param agents: The number of agents, taken from the first problems, None for every problem.
+        :param buckets: The buckets to take problems from, None for every bucket.
+        :return: Dictionary of each agent's start and goal states.
+        """
+
+        return {agent: {"start": State(0, Location(*points["start"])), "goal": State(0, Location(*points["goal"]))}
+                for agent, points in MovingAI.getAgents(problems, agents, buckets).items()}
@@ -2,38 +2,57 @@ class Node:
     """
     A class for representing a node in a graph.
 
+    Nodes are lightweight views onto a cell of an array-backed graph, so no per-cell objects are
+    stored by the graph itself. Reading or writing an attribute reads or writes the graph's arrays.
+    Search state (scores, parents, visited flags) is kept by each search rather than on the nodes.
+
     Attributes:
+        graph (Graph): The graph the node belongs to.
+        index (int): The index of the node in the graph.
         xPos (int): X-coordinate of the node.
         yPos (int): Y-coordinate of the node.
-        gScore (float): Current distance from the start node in a search.
-        fScore (float): Current estimated distance to the end node in a search.
         obstacle (bool): Indicates whether the node is an obstacle.
-        visited (bool): Indicates whether the node has been visited.
-        parent (Node): The parent node of this node.
-        neighbours ([Node]): List of nodes that neighbour this one.
+        neighbours ([int]): List of node indices that neighbour this one.
 
     Methods:
-        __init__(self, x, y): Initializes a node with co-ordinates (x, y)
+        __init__(self, graph, index): Initializes a view onto the node at a given index.
         __str__(self): Returns a string representation of the node.
-        __lt__(self, other): Returns true if the node is less than the other.
+        __eq__(self, other): Returns true if both nodes refer to the same cell.
+        __hash__(self): Returns the hash of the node.
     """
 
-    def __init__(self, x, y):
+    __slots__ = ("graph", "index")
+
+    def __init__(self, graph, index: int):
         """
-        Initializes a node with co-ordinates (x, y)
+        Initializes a view onto the node at a given index.
 
-        :param x: X-coordinate of the node.
-        :param y: Y-coordinate of the node.
+        :param graph: The graph the node belongs to.
+        :param index: The index of the node in the graph.
         """
 
-        self.xPos = x
-        self.yPos = y
-        self.gScore = 0
-        self.fScore = 0
-        self.obstacle = False
-        self.visited = False
-        self.parent = None
-        self.neighbours = []
+        self.graph = graph
+        self.index = index
+
+    @property
+    def xPos(self) -> int:
+        return self.index % self.graph.width
+
+    @property
+    def yPos(self) -> int:
+        return self.index // self.graph.width
+
+    @property
+    def obstacle(self) -> bool:
+        return self.graph.isObstacle(self.index)
+
+    @obstacle.setter
+    def obstacle(self, value: bool):
+        self.graph.setObstacle(self.index, value)
+
+    @property
+    def neighbours(self) -> list:
+        return self.graph.getNeighbours(self.index)
 
     def __str__(self) -> str:
         """
@@ -44,11 +63,23 @@ class Node:
 
         return f"(x:{self.xPos}, y:{self.yPos})"
 
-    def __lt__(self, other) -> bool:
+    def __eq__(self, other) -> bool:
         """
-        Returns true if the node is less than the other.
+        Returns true if both nodes refer to the same cell.
+
         :param other: The node to compare.
-        :return: Boolean indicating if the node is less than the other.
+        :return: Boolean indicating if the nodes are equal.
+        """
+
+        if not isinstance(other, Node):
+            return NotImplemented
+        return self.index == other.index and self.graph is other.graph
+
+    def __hash__(self) -> int:
+        """
+        Returns the hash of the node.
+
+        :return: The hash of the node.
         """
 
-        return self.fScore < other.fScore
+        return self.index
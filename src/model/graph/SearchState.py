@@ -0,0 +1,103 @@
+class SearchState:
+    """
+    A class for representing the scratch state of a single search over a graph/maze.
+
+    Each node is stamped with the generation it was last written in, so a node whose stamp does not
+    match the current generation is treated as unvisited. Resetting the state only increments the
+    generation, and every search owns its state so the graph itself is never written to.
+
+    Attributes:
+        size (int): The number of nodes the state can hold.
+        generation (int): The generation of the current search.
+        visitedStamp (list): The generation each node was last visited in.
+        closedStamp (list): The generation each node was last closed in.
+        gScore (list): The distance of each node from the start node.
+        parent (list): The parent id of each node, -1 for the start node.
+
+    Methods:
+        __init__(self, size): Initializes the search state for a given number of nodes.
+        reset(self): Resets the state for a new search.
+        visit(self, index, parent, gScore): Marks a node as visited from a given parent.
+        isVisited(self, index): Checks if a node has been visited in the current search.
+        close(self, index): Marks a node as closed.
+        isClosed(self, index): Checks if a node has been closed in the current search.
+        getPath(self, index): Returns the ids of the nodes from the start node to a given node.
+    """
+
+    def __init__(self, size: int):
+        """
+        Initializes the search state for a given number of nodes.
+
+        :param size: The number of nodes in the graph/maze.
+        """
+
+        self.size = size
+        self.generation = 1
+        self.visitedStamp = [0] * size
+        self.closedStamp = [0] * size
+        self.gScore = [0] * size
+        self.parent = [-1] * size
+
+    def reset(self):
+        """
+        Resets the state for a new search.
+        """
+
+        self.generation += 1
+
+    def visit(self, index: int, parent: int = -1, gScore: int = 0):
+        """
+        Marks a node as visited from a given parent.
+
+        :param index: The id of the node.
+        :param parent: The id of the parent node.
+        :param gScore: The distance of the node from the start node.
+        """
+
+        self.visitedStamp[index] = self.generation
+        self.parent[index] = parent
+        self.gScore[index] = gScore
+
+    def isVisited(self, index: int) -> bool:
+        """
+        Checks if a node has been visited in the current search.
+
+        :param index: The id of the node.
+        :return: Boolean value indicating if the node has been visited.
+        """
+
+        return self.visitedStamp[index] == self.generation
+
+    def close(self, index: int):
+        """
+        Marks a node as closed.
+
+        :param index: The id of the node.
+        """
+
+        self.closedStamp[index] = self.generation
+
+    def isClosed(self, index: int) -> bool:
+        """
+        Checks if a node has been closed in the current search.
+
+        :param index: The id of the node.
+        :return: Boolean value indicating if the node has been closed.
+        """
+
+        return self.closedStamp[index] == self.generation
+
+    def getPath(self, index: int) -> list:
+        """
+        Returns the ids of the nodes from the start node to a given node.
+
+        :param index: The id of the final node in the path.
+        :return: List of node ids representing the path.
+        """
+
+        path = [index]
+        while self.parent[index] != -1:
+            index = self.parent[index]
+            path.append(index)
+        path.reverse()
+        return path
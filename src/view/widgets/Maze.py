@@ -1,7 +1,7 @@
-from PyQt5.QtCore import pyqtSignal, Qt
+from PyQt5.QtCore import pyqtSignal, Qt, QRect, QRectF
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter, QPen, QRegion
 from PyQt5.QtWidgets import *
 
-from src.model.graph.Graph import Graph
 from src.view.widgets.Info import Info
 
 
@@ -9,19 +9,43 @@ class Maze(QWidget):
     """
     Maze widget for the application.
 
+    The maze is painted onto a single widget: the colour of each cell is stored as one pixel of an
+    image that is scaled onto the widget, and the text of each cell is drawn over it. Changing a
+    cell only updates its pixel and marks its rectangle as dirty, so Qt repaints just that area.
+    Mouse presses and releases are mapped back to cells, and like a button a cell is clicked when
+    the left button is released over the cell it was pressed on.
+
     Attributes:
-        mainLayout (QGridLayout): Main layout for the Maze widget.
+        mainLayout (QGridLayout): Main layout for the Maze widget, holding the info widget.
+        mazeWidth (int): The number of columns in the maze, 0 when no maze is drawn.
+        mazeHeight (int): The number of rows in the maze, 0 when no maze is drawn.
+        image (QImage): The colour of each cell, one pixel per cell.
+        texts (dict): The text of each (row, column) cell that has text.
+        colours (dict): The RGB value of each colour name used, so names are only parsed once.
+        pressedCell (tuple): The cell the left button was pressed on, None when it is not held down.
 
     Methods:
         __init__(self, parent=None): Initialize the Maze widget.
         drawMaze(self, width, height): Draw a maze at a given size.
         changeCell (self, x, y, colour, text): Change a cell in the Maze widget.
+        changeCells (self, changes): Change many cells in the Maze widget with a single repaint.
+        setCell(self, x, y, colour, text): Stores the colour and text of a cell without repainting it.
         drawInfo (self): Draw the info widget to the maze.
         clear (self): Clear the Maze widget.
+        getMazeRect(self): Returns the area of the widget the maze is painted in.
+        getCellRect(self, x, y): Returns the area of the widget a cell is painted in.
+        getCellAt(self, position): Returns the cell under a position of the widget.
+        paintEvent(self, event): Paints the cells in the dirty region of the widget.
+        paintArea(self, painter, mazeRect, cellSize, area): Paints the cells overlapping an area of the widget.
+        mousePressEvent(self, event): Stores the cell the left button is pressed on.
+        mouseReleaseEvent(self, event): Emits a click if the left button is released over the pressed cell.
     """
 
     cellClicked = pyqtSignal(int, int)
 
+    gridColour = QColor("#D5CCBA")
+    mazeSize = 500
+
     def __init__(self):
         """
         Initialize the Maze widget.
@@ -35,6 +59,13 @@ class Maze(QWidget):
         self.mainLayout = QGridLayout()
         self.setLayout(self.mainLayout)
 
+        self.mazeWidth = 0
+        self.mazeHeight = 0
+        self.image = QImage()
+        self.texts = {}
+        self.colours = {}
+        self.pressedCell = None
+
         self.drawInfo()
 
     def drawMaze(self, width: int, height: int):
@@ -46,30 +77,63 @@ class Maze(QWidget):
         """
         self.clear()
 
-        for x in range(width):
-            for y in range(height):
-                button = QPushButton()
-                button.setFixedSize(int(500/width), int(500/width))
-                button.setObjectName("mazeCell")
-                button.clicked.connect(lambda _, xPos=x, yPos=y, btn=Qt.LeftButton: self.cellClicked.emit(xPos, yPos))
-                button.setStyleSheet("background-color: white;")
-                self.mainLayout.addWidget(button, x, y)
+        self.mazeWidth = width
+        self.mazeHeight = height
+        self.image = QImage(width, height, QImage.Format_RGB32)
+        self.image.fill(Qt.white)
+        self.update()
 
     def changeCell(self, x: int, y: int, colour: str, text: str = ""):
         """
         Change a cell in the Maze widget.
 
-        :param x: X coordinate of the cell to be changed.
-        :param y: Y coordinate of the cell to be changed.
+        :param x: X coordinate (row) of the cell to be changed.
+        :param y: Y coordinate (column) of the cell to be changed.
         :param colour: Colour to change the cell to.
         :param text: Text to change the cell to.
         """
 
-        cell = self.mainLayout.itemAtPosition(x, y)
-        if cell:
-            button = cell.widget()
-            button.setText(text)
-            button.setStyleSheet(f"background-color: {colour};")
+        if not (0 <= x < self.mazeHeight and 0 <= y < self.mazeWidth):
+            return
+
+        self.setCell(x, y, colour, text)
+        self.update(self.getCellRect(x, y))
+
+    def changeCells(self, changes):
+        """
+        Change many cells in the Maze widget, repainting the region of the changed cells once.
+
+        :param changes: Iterable of the (x, y, colour, text) of each cell to be changed.
+        """
+
+        region = QRegion()
+        for x, y, colour, text in changes:
+            if not (0 <= x < self.mazeHeight and 0 <= y < self.mazeWidth):
+                continue
+            self.setCell(x, y, colour, text)
+            region = region.united(self.getCellRect(x, y))
+
+        if not region.isEmpty():
+            self.update(region)
+
+    def setCell(self, x: int, y: int, colour: str, text: str):
+        """
+        Stores the colour and text of a cell without repainting it.
+
+        :param x: X coordinate (row) of the cell.
+        :param y: Y coordinate (column) of the cell.
+        :param colour: Colour of the cell.
+        :param text: Text of the cell, empty for none.
+        """
+
+        rgb = self.colours.get(colour)
+        if rgb is None:
+            rgb = self.colours[colour] = QColor(colour).rgb()
+        self.image.setPixel(y, x, rgb)
+        if text:
+            self.texts[(x, y)] = text
+        else:
+            self.texts.pop((x, y), None)
 
     def drawInfo(self):
         """
@@ -90,3 +154,149 @@ class Maze(QWidget):
             item = self.mainLayout.takeAt(0)
             if item.widget():
                 item.widget().deleteLater()
+
+        self.mazeWidth = 0
+        self.mazeHeight = 0
+        self.image = QImage()
+        self.texts = {}
+        self.pressedCell = None
+        self.update()
+
+    def getMazeRect(self) -> QRectF:
+        """
+        Returns the area of the widget the maze is painted in, centred with square cells.
+
+        :return: The rectangle of the maze in widget coordinates.
+        """
+
+        cellSize = self.mazeSize / max(self.mazeWidth, self.mazeHeight, 1)
+        width = cellSize * self.mazeWidth
+        height = cellSize * self.mazeHeight
+        return QRectF((self.width() - width) / 2, (self.height() - height) / 2, width, height)
+
+    def getCellRect(self, x: int, y: int) -> QRect:
+        """
+        Returns the area of the widget a cell is painted in.
+
+        :param x: X coordinate (row) of the cell.
+        :param y: Y coordinate (column) of the cell.
+        :return: The rectangle of the cell in widget coordinates, rounded outwards.
+        """
+
+        mazeRect = self.getMazeRect()
+        cellSize = mazeRect.width() / self.mazeWidth
+        return QRectF(mazeRect.left() + y * cellSize, mazeRect.top() + x * cellSize,
+                      cellSize, cellSize).toAlignedRect()
+
+    def getCellAt(self, position):
+        """
+        Returns the cell under a position of the widget.
+
+        :param position: The position in widget coordinates.
+        :return: The (row, column) of the cell, None if the position is outside the maze.
+        """
+
+        if not self.mazeWidth:
+            return None
+
+        mazeRect = self.getMazeRect()
+        cellSize = mazeRect.width() / self.mazeWidth
+        x = int((position.y() - mazeRect.top()) // cellSize)
+        y = int((position.x() - mazeRect.left()) // cellSize)
+        if 0 <= x < self.mazeHeight and 0 <= y < self.mazeWidth:
+            return x, y
+        return None
+
+    def paintEvent(self, event):
+        """
+        Paints the cells in the dirty region of the widget.
+
+        The region is painted one rectangle at a time, so scattered changes do not repaint the
+        cells between them.
+
+        :param event: The paint event holding the dirty region.
+        """
+
+        if not self.mazeWidth:
+            return
+
+        mazeRect = self.getMazeRect()
+        cellSize = mazeRect.width() / self.mazeWidth
+        painter = QPainter(self)
+        for rect in event.region().rects():
+            self.paintArea(painter, mazeRect, cellSize, rect)
+        painter.end()
+
+    def paintArea(self, painter, mazeRect, cellSize, area):
+        """
+        Paints the cells overlapping an area of the widget.
+
+        Only the cells overlapping the area are copied from the image, and grid lines and text are
+        only drawn once cells are large enough for them to be legible.
+
+        :param painter: The painter of the widget.
+        :param mazeRect: The area of the widget the maze is painted in.
+        :param cellSize: The width and height of each cell.
+        :param area: The area of the widget to paint.
+        """
+
+        dirty = QRectF(area).intersected(mazeRect)
+        if dirty.isEmpty():
+            return
+
+        firstRow = max(int((dirty.top() - mazeRect.top()) // cellSize), 0)
+        lastRow = min(int((dirty.bottom() - mazeRect.top()) // cellSize), self.mazeHeight - 1)
+        firstColumn = max(int((dirty.left() - mazeRect.left()) // cellSize), 0)
+        lastColumn = min(int((dirty.right() - mazeRect.left()) // cellSize), self.mazeWidth - 1)
+        rows = lastRow - firstRow + 1
+        columns = lastColumn - firstColumn + 1
+
+        target = QRectF(mazeRect.left() + firstColumn * cellSize, mazeRect.top() + firstRow * cellSize,
+                        columns * cellSize, rows * cellSize)
+        painter.drawImage(target, self.image, QRectF(firstColumn, firstRow, columns, rows))
+
+        if cellSize >= 6:
+            painter.setPen(QPen(self.gridColour, max(cellSize / 12, 1)))
+            for row in range(firstRow, lastRow + 2):
+                top = mazeRect.top() + row * cellSize
+                painter.drawLine(int(target.left()), int(top), int(target.right()), int(top))
+            for column in range(firstColumn, lastColumn + 2):
+                left = mazeRect.left() + column * cellSize
+                painter.drawLine(int(left), int(target.top()), int(left), int(target.bottom()))
+
+        if self.texts and cellSize >= 8:
+            font = QFont(self.font())
+            font.setPixelSize(max(int(cellSize / 2), 1))
+            painter.setFont(font)
+            painter.setPen(Qt.black)
+            for x in range(firstRow, lastRow + 1):
+                for y in range(firstColumn, lastColumn + 1):
+                    text = self.texts.get((x, y))
+                    if text:
+                        painter.drawText(QRectF(mazeRect.left() + y * cellSize, mazeRect.top() + x * cellSize,
+                                                cellSize, cellSize), Qt.AlignCenter, text)
+
+    def mousePressEvent(self, event):
+        """
+        Stores the cell the left button is pressed on.
+
+        :param event: The mouse event.
+        """
+
+        if event.button() == Qt.LeftButton:
+            self.pressedCell = self.getCellAt(event.pos())
+
+    def mouseReleaseEvent(self, event):
+        """
+        Emits a click if the left button is released over the cell it was pressed on.
+
+        :param event: The mouse event.
+        """
+
+        if event.button() != Qt.LeftButton:
+            return
+
+        cell = self.pressedCell
+        self.pressedCell = None
+        if cell is not None and cell == self.getCellAt(event.pos()):
+            self.cellClicked.emit(*cell)
@@ -1,4 +1,4 @@
-from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import pyqtSignal, Qt
 from PyQt5.QtWidgets import *
 
 
@@ -20,6 +20,10 @@ class SAMenu(QWidget):
         agentGoal (QLineEdit): Goal position of the agent.
         randomiseButton (QPushButton): Button for randomising the maze.
         playButton (QPushButton): Button for playing the maze animation.
+        cancelButton (QPushButton): Button for cancelling a running search.
+        statusLabel (QLabel): Label for the progress and outcome of a search.
+        speedSlider (QSlider): Slider for the number of timesteps the animation plays per second.
+        seekSlider (QSlider): Slider for the timestep the animation displays.
 
     Methods:
         __init__(self, parent=None): Initialize the Single-Agent Menu widget.
@@ -134,5 +138,31 @@ class SAMenu(QWidget):
         self.playButton.setObjectName("menuButton")
         mazeControlLayout.addWidget(self.playButton)
 
+        self.cancelButton = QPushButton("Cancel")
+        self.cancelButton.setObjectName("menuButton")
+        self.cancelButton.setEnabled(False)
+        mazeControlLayout.addWidget(self.cancelButton)
+
+        self.statusLabel = QLabel()
+        self.statusLabel.setObjectName("menuStatus")
+        self.mainLayout.addWidget(self.statusLabel)
+
+        playbackLayout = QHBoxLayout()
+        self.mainLayout.addLayout(playbackLayout)
+
+        speedLabel = QLabel("Speed")
+        speedLabel.setObjectName("menuStatus")
+        playbackLayout.addWidget(speedLabel)
+
+        self.speedSlider = QSlider(Qt.Horizontal)
+        self.speedSlider.setRange(1, 60)
+        self.speedSlider.setValue(3)
+        playbackLayout.addWidget(self.speedSlider)
+
+        self.seekSlider = QSlider(Qt.Horizontal)
+        self.seekSlider.setRange(0, 0)
+        self.seekSlider.setEnabled(False)
+        self.mainLayout.addWidget(self.seekSlider)
+
         spacer = QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding)
         self.mainLayout.addItem(spacer)
@@ -0,0 +1,75 @@
+import random
+import threading
+import time
+
+import pytest
+
+from src.model.Solver import Solver
+from src.model.agents.Budget import Budget
+from src.model.agents.CancelToken import CancelToken
+from src.model.agents.SearchResult import SearchResult
+from src.model.agents.cbs.CBS import CBS
+from src.model.agents.cbs.CBSUtils import State, Location
+
+
+def createLargeInstance(size=512, agents=30, seed=1):
+    """
+    Creates a maze large enough that planning the root of CBS takes several seconds.
+    """
+
+    rng = random.Random(seed)
+    obstacles = [(row, column) for row in range(size) for column in range(size) if rng.random() < 0.1]
+    graph = Solver().createGraph(size, size, obstacles)
+    free = [cell for cell in range(size * size) if not graph.obstacles[cell]]
+    cells = rng.sample(free, 2 * agents)
+    waypoints = {f"agent{agent + 1}": {"start": State(0, Location(*divmod(cells[2 * agent], size))),
+                                       "goal": State(0, Location(*divmod(cells[2 * agent + 1], size)))}
+                 for agent in range(agents)}
+    return graph, waypoints
+
+
+def cancelLater(cancel, delay):
+    timer = threading.Timer(delay, cancel)
+    timer.start()
+    return timer
+
+
+def testCancelDuringRootPlanning():
+    graph, waypoints = createLargeInstance()
+    cancelToken = CancelToken()
+    reports = []
+    budget = Budget(cancelToken=cancelToken, progress=lambda expansions, elapsed: reports.append(elapsed))
+
+    timer = cancelLater(cancelToken.cancel, 0.3)
+    startTime = time.perf_counter()
+    search = CBS()
+    result = search.solve(graph, waypoints, budget)
+    elapsed = time.perf_counter() - startTime
+    timer.join()
+
+    assert result.status == SearchResult.CANCELLED
+    assert search.statistics["expanded"] == 0
+    assert elapsed < 1.0
+    assert reports
+
+
+def testSearchWorkerCancelDuringRootPlanning():
+    pytest.importorskip("PyQt5")
+    from src.controller.SearchWorker import SearchWorker
+
+    graph, waypoints = createLargeInstance()
+    worker = SearchWorker(lambda budget: CBS().solve(graph, waypoints, budget))
+    results = []
+    reports = []
+    worker.solved.connect(results.append)
+    worker.progress.connect(lambda expansions, elapsed: reports.append(elapsed))
+
+    timer = cancelLater(worker.cancel, 0.3)
+    startTime = time.perf_counter()
+    worker.run()
+    elapsed = time.perf_counter() - startTime
+    timer.join()
+
+    assert [result.status for result in results] == [SearchResult.CANCELLED]
+    assert elapsed < 1.0
+    assert reports
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from src.model.agents.cbs.CBSUtils import State, Location
+from src.model.agents.cbs.ConflictTable import ConflictTable
+
+
+def createPath(cells):
+    return [State(time, Location(x, y)) for time, (x, y) in enumerate(cells)]
+
+
+def createRandomPath(rng, size, length):
+    cells = [(rng.randrange(size), rng.randrange(size))]
+    for _ in range(length - 1):
+        x, y = cells[-1]
+        dx, dy = rng.choice([(0, 0), (1, 0), (-1, 0), (0, 1), (0, -1)])
+        cells.append((min(max(x + dx, 0), size - 1), min(max(y + dy, 0), size - 1)))
+    return createPath(cells)
+
+
+def describe(table):
+    return {pair: [(conflict.time, conflict.type, conflict.agent_1, conflict.agent_2, conflict.location_1.key,
+                    conflict.location_2.key) for conflict in conflicts]
+            for pair, conflicts in table.pairs.items()}
+
+
+def assertSameTable(updated, rebuilt):
+    assert len(updated) == len(rebuilt)
+    assert describe(updated) == describe(rebuilt)
+    first = updated.getFirst()
+    expected = rebuilt.getFirst()
+    if not expected:
+        assert first is False
+    else:
+        assert (first.time, first.agent_1, first.agent_2) == (expected.time, expected.agent_1, expected.agent_2)
+
+
+def testUpdateMatchesRebuildAfterReplanning():
+    solution = {"agent1": createPath([(0, 0), (0, 1), (0, 2)]),
+                "agent2": createPath([(0, 2), (0, 1), (0, 0)]),
+                "agent3": createPath([(1, 1), (0, 1)])}
+    table = ConflictTable.fromSolution(solution)
+
+    solution["agent2"] = createPath([(0, 2), (1, 2), (1, 1), (1, 0), (0, 0)])
+    assertSameTable(table.update(solution, "agent2"), ConflictTable.fromSolution(solution))
+
+
+def testUpdateMatchesRebuildWhenAPathEndsBeforeAConflict():
+    solution = {"agent1": createPath([(0, 0), (0, 1)]),
+                "agent2": createPath([(1, 1), (1, 0), (0, 0)])}
+    table = ConflictTable.fromSolution(solution)
+
+    solution["agent2"] = createPath([(1, 1), (1, 2), (0, 2), (0, 2), (0, 1), (0, 0)])
+    updated = table.update(solution, "agent2")
+
+    assert [conflict.time for conflict in updated.getConflicts()] == [4]
+    assertSameTable(updated, ConflictTable.fromSolution(solution))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def testUpdateMatchesRebuildOnRandomPaths(seed):
+    rng = random.Random(seed)
+    solution = {f"agent{agent + 1}": createRandomPath(rng, 4, rng.randint(1, 8)) for agent in range(5)}
+    table = ConflictTable.fromSolution(solution)
+
+    for _ in range(5):
+        agent = rng.choice(list(solution))
+        solution[agent] = createRandomPath(rng, 4, rng.randint(1, 8))
+        table = table.update(solution, agent)
+        assertSameTable(table, ConflictTable.fromSolution(solution))
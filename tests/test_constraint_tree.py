@@ -0,0 +1,39 @@
+from src.model.agents.cbs.CBS import ConstraintTreeNode
+from src.model.agents.cbs.CBSUtils import Constraints, VertexConstraint, EdgeConstraint, Location
+
+
+def vertex(time, x, y):
+    return Constraints(vertex=VertexConstraint(time, Location(x, y)))
+
+
+def edge(time, x, y):
+    return Constraints(edge=EdgeConstraint(time, Location(x, y), Location(x, y + 1)))
+
+
+def testNodesWithTheSameConstraintsInAnyOrderAreEqual():
+    root = ConstraintTreeNode()
+    first = ConstraintTreeNode(ConstraintTreeNode(root, "agent1", vertex(2, 1, 1)), "agent2", edge(3, 0, 0))
+    second = ConstraintTreeNode(ConstraintTreeNode(root, "agent2", edge(3, 0, 0)), "agent1", vertex(2, 1, 1))
+
+    assert first == second
+    assert hash(first) == hash(second)
+    assert len({first, second}) == 1
+
+
+def testNodesWithDifferentConstraintsAreNotEqual():
+    root = ConstraintTreeNode()
+    node = ConstraintTreeNode(root, "agent1", vertex(2, 1, 1))
+
+    assert node != root
+    assert node != ConstraintTreeNode(root, "agent2", vertex(2, 1, 1))
+    assert node != ConstraintTreeNode(root, "agent1", vertex(3, 1, 1))
+    assert node == ConstraintTreeNode(node, "agent1", Constraints())
+
+
+def testKeyIsComputedFromTheParent():
+    root = ConstraintTreeNode()
+    node = ConstraintTreeNode(root, "agent1", vertex(2, 1, 1))
+    child = ConstraintTreeNode(node, "agent2", edge(3, 0, 0))
+
+    assert root.getKey() == 0
+    assert child.getKey() == node.getKey() + sum([hash(("agent2",) + key) for key in edge(3, 0, 0).getKey()])
@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from src.model.Solver import Solver
+from src.model.agents.cbs.CBS import CBS
+from src.model.agents.cbs.CBSUtils import Conflict, Constraints, VertexConstraint, EdgeConstraint, State, Location
+
+
+def createInstance(seed, size=8, density=0.2, agents=4):
+    rng = random.Random(seed)
+    obstacles = [(row, column) for row in range(size) for column in range(size) if rng.random() < density]
+    graph = Solver().createGraph(size, size, obstacles)
+    free = [cell for cell in range(size * size) if not graph.obstacles[cell]]
+    cells = rng.sample(free, 2 * agents)
+    waypoints = {f"agent{agent + 1}": {"start": State(0, Location(*divmod(cells[2 * agent], size))),
+                                       "goal": State(0, Location(*divmod(cells[2 * agent + 1], size)))}
+                 for agent in range(agents)}
+    return graph, waypoints
+
+
+def locations(path):
+    return [(state.location.x, state.location.y) for state in path]
+
+
+def plan(graph, start, goal, constraints):
+    return CBS().AStarWithConstraints(graph, State(0, Location(*start)), State(0, Location(*goal)), constraints)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def testDisjointSplittingFindsTheOptimalCost(seed):
+    graph, waypoints = createInstance(seed)
+    plain = CBS().solve(graph, waypoints)
+    disjoint = CBS(disjointSplitting=True).solve(graph, waypoints)
+
+    assert plain.status == disjoint.status
+    assert plain.cost == disjoint.cost
+
+
+def testDisjointSplittingFindsTheOptimalCostInACorridor():
+    graph = Solver().createGraph(5, 2, [(1, 0), (1, 1), (1, 3), (1, 4)])
+    waypoints = {"agent1": {"start": State(0, Location(0, 0)), "goal": State(0, Location(0, 4))},
+                 "agent2": {"start": State(0, Location(0, 4)), "goal": State(0, Location(0, 0))}}
+    plain = CBS().solve(graph, waypoints)
+    disjoint = CBS(disjointSplitting=True).solve(graph, waypoints)
+
+    assert plain.isSolved() and disjoint.isSolved()
+    assert plain.cost == disjoint.cost
+
+
+def testPositiveVertexConstraintForcesTheLandmark():
+    graph = Solver().createGraph(3, 3, [])
+    constraints = Constraints(positive=VertexConstraint(2, Location(1, 1)))
+    path = plan(graph, (0, 0), (0, 2), constraints)
+
+    assert locations(path)[2] == (1, 1)
+    assert locations(path)[-1] == (0, 2)
+    assert len(path) == 5
+    assert constraints.isSatisfiedBy(path)
+
+
+def testPositiveEdgeConstraintForcesTheMove():
+    graph = Solver().createGraph(3, 3, [])
+    conflict = Conflict(1, 2, "agent1", "agent2", Location(1, 0), Location(1, 1))
+    (_, negative), (agent, positive) = CBS().createDisjointConstraints(conflict)
+    path = plan(graph, (0, 0), (0, 2), positive)
+
+    assert agent == "agent1"
+    assert locations(path)[1:3] == [(1, 0), (1, 1)]
+    assert locations(path)[-1] == (0, 2)
+    assert positive.isSatisfiedBy(path)
+    assert not negative.isSatisfiedBy(path)
+
+
+def testPositiveConstraintAtTheGoalDelaysNothing():
+    constraints = Constraints(positive=VertexConstraint(5, Location(0, 2)))
+
+    assert constraints.getGoalTime(Location(0, 2).key) == 0
+    assert constraints.getGoalTime(Location(1, 1).key) == 5
+
+
+def testGoalTimeWaitsOutVertexConstraints():
+    constraints = Constraints(vertex=VertexConstraint(3, Location(0, 2)))
+    constraints.addPositive(VertexConstraint(2, Location(1, 1)))
+
+    assert constraints.getGoalTime(Location(0, 2).key) == 4
+    assert constraints.getGoalTime(Location(1, 1).key) == 0
+    assert constraints.getGoalTime(Location(2, 2).key) == 2
+
+
+def testImpliedConstraintsForbidTheLandmarksAndTheReverseMove():
+    constraints = Constraints(positive=VertexConstraint(1, Location(1, 0)))
+    constraints.addPositive(VertexConstraint(2, Location(1, 1)))
+    implied = constraints.getImplied()
+
+    assert implied.isVertexConstrained(1, Location(1, 0).key)
+    assert implied.isVertexConstrained(2, Location(1, 1).key)
+    assert implied.isEdgeConstrained(1, Location(1, 1).key, Location(1, 0).key)
+    assert not implied.isEdgeConstrained(1, Location(1, 0).key, Location(1, 1).key)
+    assert not implied.isVertexConstrained(1, Location(1, 1).key)
+    assert not implied.positive_constraints
+
+
+def testIsSatisfiedByChecksTheWaitAtTheGoal():
+    path = [State(0, Location(0, 0)), State(1, Location(0, 1))]
+
+    assert Constraints(positive=VertexConstraint(3, Location(0, 1))).isSatisfiedBy(path)
+    assert not Constraints(positive=VertexConstraint(3, Location(1, 1))).isSatisfiedBy(path)
+    assert not Constraints(vertex=VertexConstraint(3, Location(0, 1))).isSatisfiedBy(path)
+    assert not Constraints(edge=EdgeConstraint(0, Location(0, 0), Location(0, 1))).isSatisfiedBy(path)
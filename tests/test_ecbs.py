@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from src.model.Solver import Solver
+from src.model.agents.cbs.CBS import CBS
+from src.model.agents.cbs.CBSUtils import State, Location
+from src.model.agents.cbs.ConflictTable import ConflictTable
+from src.model.agents.cbs.ECBS import ECBS
+
+
+def createInstance(seed, size=8, density=0.2, agents=5):
+    rng = random.Random(seed)
+    obstacles = [(row, column) for row in range(size) for column in range(size) if rng.random() < density]
+    graph = Solver().createGraph(size, size, obstacles)
+    free = [cell for cell in range(size * size) if not graph.obstacles[cell]]
+    cells = rng.sample(free, 2 * agents)
+    waypoints = {f"agent{agent + 1}": {"start": State(0, Location(*divmod(cells[2 * agent], size))),
+                                       "goal": State(0, Location(*divmod(cells[2 * agent + 1], size)))}
+                 for agent in range(agents)}
+    return graph, waypoints
+
+
+@pytest.mark.parametrize("suboptimality", [1, 1.1, 1.5, 2])
+@pytest.mark.parametrize("seed", range(10))
+def testCostIsWithinTheSuboptimalityOfTheOptimum(seed, suboptimality):
+    graph, waypoints = createInstance(seed)
+    optimal = CBS().solve(graph, waypoints)
+    result = ECBS(suboptimality).solve(graph, waypoints)
+
+    assert result.status == optimal.status
+    if optimal.isSolved():
+        assert optimal.cost <= result.cost <= suboptimality * optimal.cost
+        assert result.lowerBound <= optimal.cost
+        assert result.cost <= suboptimality * result.lowerBound
+        paths = {agent: [State(step["t"], Location(step["x"], step["y"])) for step in path]
+                 for agent, path in result.solution.items()}
+        assert len(ConflictTable.fromSolution(paths)) == 0
+
+
+def testWithoutSuboptimalityTheCostIsOptimal():
+    graph = Solver().createGraph(5, 2, [(1, 0), (1, 1), (1, 3), (1, 4)])
+    waypoints = {"agent1": {"start": State(0, Location(0, 0)), "goal": State(0, Location(0, 4))},
+                 "agent2": {"start": State(0, Location(0, 4)), "goal": State(0, Location(0, 0))}}
+
+    assert ECBS(1).solve(graph, waypoints).cost == CBS().solve(graph, waypoints).cost
+
+
+def testSuboptimalityBelowOneIsRejected():
+    with pytest.raises(ValueError):
+        ECBS(0.9)
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from src.model.agents.FocalList import FocalList
+
+
+def testPopsByPriorityWithinTheBound():
+    focal = FocalList(1.5)
+    focal.push("a", 10, 10, 3)
+    focal.push("b", 10, 15, 1)
+    focal.push("c", 11, 16, 0)
+
+    assert focal.pop() == "b"
+    assert focal.pop() == "a"
+    assert focal.pop() == "c"
+    assert len(focal) == 0
+
+
+def testPopsByCostThenPriorityWithoutSuboptimality():
+    focal = FocalList()
+    focal.push("a", 4, 4, 2)
+    focal.push("b", 3, 3, 5)
+    focal.push("c", 4, 4, 1)
+
+    assert [focal.pop() for _ in range(3)] == ["b", "c", "a"]
+
+
+def testPendingEntriesMoveIntoFocalWhenTheLowerBoundRises():
+    focal = FocalList(1.2)
+    focal.push("a", 10, 10, 5)
+    focal.push("b", 12, 14, 0)
+
+    assert focal.pop() == "a"
+    assert focal.getLowerBound() == 12
+    assert focal.pop() == "b"
+
+
+def testFocalEntriesLeaveWhenTheLowerBoundFalls():
+    focal = FocalList(1.2)
+    focal.push("a", 10, 10, 5)
+    focal.push("b", 10, 12, 1)
+    focal.push("c", 10, 12, 2)
+    assert focal.pop() == "b"
+
+    focal.push("d", 8, 8, 9)
+
+    assert focal.pop() == "d"
+    assert focal.pop() == "c"
+    assert focal.pop() == "a"
+
+
+def testPopFromAnEmptyListRaises():
+    focal = FocalList(1.5)
+    focal.push("a", 1, 1, 1)
+    focal.pop()
+
+    with pytest.raises(IndexError):
+        focal.pop()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def testPopKeepsToTheBound(seed):
+    rng = random.Random(seed)
+    suboptimality = rng.choice([1, 1.25, 1.5, 2])
+    focal = FocalList(suboptimality)
+    queued = []
+    for index in range(200):
+        if queued and rng.random() < 0.4:
+            bound = suboptimality * min([lowerBound for lowerBound, _, _, _ in queued])
+            within = [entry for entry in queued if entry[1] <= bound]
+            expected = min(within, key=lambda entry: (entry[2], entry[3]))
+            assert focal.pop() == expected[3]
+            queued.remove(expected)
+        else:
+            lowerBound = rng.randint(0, 20)
+            entry = (lowerBound, rng.randint(lowerBound, int(suboptimality * lowerBound)), rng.randint(0, 5), index)
+            focal.push(entry[3], *entry[:3])
+            queued.append(entry)
+        assert len(focal) == len(queued)
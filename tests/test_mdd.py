@@ -0,0 +1,113 @@
+from src.model.Solver import Solver
+from src.model.agents.cbs.CBS import CBS, ConstraintTreeNode
+from src.model.agents.cbs.CBSUtils import Conflict, Constraints, VertexConstraint, State, Location
+from src.model.agents.cbs.ConflictTable import ConflictTable
+from src.model.agents.cbs.MDD import MDD
+
+
+def createMDD(graph, start, goal, cost, constraints=None):
+    return MDD(graph, State(0, Location(*start)), State(0, Location(*goal)), cost,
+               constraints if constraints is not None else Constraints())
+
+
+def cells(graph, *locations):
+    return {x * graph.width + y for x, y in locations}
+
+
+def createPath(locations):
+    return [State(time, Location(x, y)) for time, (x, y) in enumerate(locations)]
+
+
+def classify(graph, conflict, first, second):
+    mddOne = createMDD(graph, *first)
+    mddTwo = createMDD(graph, *second)
+    return CBS().classifyConflict(graph, conflict, mddOne, mddTwo)
+
+
+def testMDDHoldsEveryOptimalPath():
+    graph = Solver().createGraph(3, 3, [])
+    mdd = createMDD(graph, (0, 0), (2, 2), 5)
+
+    assert mdd.depth == 4
+    assert mdd.levels == [cells(graph, (0, 0)), cells(graph, (0, 1), (1, 0)), cells(graph, (0, 2), (1, 1), (2, 0)),
+                          cells(graph, (1, 2), (2, 1)), cells(graph, (2, 2))]
+    assert mdd.getLevel(7) == cells(graph, (2, 2))
+
+
+def testMDDIncludesWaitsWhenTheCostAllowsThem():
+    graph = Solver().createGraph(3, 1, [])
+    mdd = createMDD(graph, (0, 0), (0, 2), 4)
+
+    assert mdd.levels == [cells(graph, (0, 0)), cells(graph, (0, 0), (0, 1)), cells(graph, (0, 1), (0, 2)),
+                          cells(graph, (0, 2))]
+    assert mdd.isSingleton(0, 0)
+    assert not mdd.isSingleton(1, 1)
+
+
+def testMDDPrunesConstrainedCells():
+    graph = Solver().createGraph(3, 3, [])
+    constraints = Constraints(vertex=VertexConstraint(1, Location(0, 1)))
+    mdd = createMDD(graph, (0, 0), (2, 2), 5, constraints)
+
+    assert mdd.levels[1] == cells(graph, (1, 0))
+    assert mdd.levels[2] == cells(graph, (1, 1), (2, 0))
+
+
+def testCardinalVertexConflict():
+    graph = Solver().createGraph(3, 1, [])
+    conflict = Conflict(1, 1, "agent1", "agent2", Location(0, 1))
+
+    assert classify(graph, conflict, ((0, 0), (0, 2), 3), ((0, 2), (0, 0), 3)) == 2
+
+
+def testCardinalEdgeConflict():
+    graph = Solver().createGraph(2, 1, [])
+    conflict = Conflict(0, 2, "agent1", "agent2", Location(0, 0), Location(0, 1))
+
+    assert classify(graph, conflict, ((0, 0), (0, 1), 2), ((0, 1), (0, 0), 2)) == 2
+
+
+def testSemiCardinalVertexConflict():
+    graph = Solver().createGraph(3, 3, [])
+    conflict = Conflict(1, 1, "agent1", "agent2", Location(0, 1))
+
+    assert classify(graph, conflict, ((0, 0), (0, 2), 3), ((1, 1), (0, 0), 3)) == 1
+
+
+def testNonCardinalVertexConflict():
+    graph = Solver().createGraph(3, 3, [])
+    conflict = Conflict(1, 1, "agent1", "agent2", Location(0, 1))
+
+    assert classify(graph, conflict, ((0, 0), (1, 1), 3), ((0, 2), (1, 0), 4)) == 0
+
+
+def testCardinalConflictAtAGoalAfterThePathEnds():
+    graph = Solver().createGraph(4, 1, [])
+    conflict = Conflict(2, 1, "agent1", "agent2", Location(0, 2))
+
+    assert classify(graph, conflict, ((0, 1), (0, 2), 2), ((0, 0), (0, 3), 4)) == 2
+
+
+def testSemiCardinalConflictAtAGoalAfterThePathEnds():
+    graph = Solver().createGraph(4, 2, [])
+    conflict = Conflict(2, 1, "agent1", "agent2", Location(0, 2))
+
+    assert classify(graph, conflict, ((0, 1), (0, 2), 2), ((0, 0), (1, 3), 5)) == 1
+
+
+def testChooseConflictPrefersCardinalConflicts():
+    graph = Solver().createGraph(6, 3, [(0, 3), (0, 4), (0, 5), (1, 3), (1, 4), (1, 5)])
+    waypoints = {}
+    solution = {}
+    for agent, locations in [("agent1", [(0, 0), (0, 1), (1, 1)]), ("agent2", [(0, 2), (0, 1), (0, 0), (1, 0)]),
+                             ("agent3", [(2, 3), (2, 4), (2, 5)]), ("agent4", [(2, 5), (2, 4), (2, 3)])]:
+        solution[agent] = createPath(locations)
+        waypoints[agent] = {"start": State(0, Location(*locations[0])), "goal": State(0, Location(*locations[-1]))}
+    node = ConstraintTreeNode()
+    node.conflictTable = ConflictTable.fromSolution(solution)
+
+    first = CBS().chooseConflict(graph, waypoints, node, solution)
+    cardinal = CBS(prioritiseConflicts=True).chooseConflict(graph, waypoints, node, solution)
+
+    assert (first.agent_1, first.agent_2) == ("agent1", "agent2")
+    assert (cardinal.agent_1, cardinal.agent_2) == ("agent3", "agent4")
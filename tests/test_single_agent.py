@@ -0,0 +1,32 @@
+import threading
+
+from src.model.Solver import Solver
+from src.model.agents.SingleAgent import SingleAgent
+
+
+def createMaze(size, wall):
+    return Solver().createGraph(size, size, [(row, wall) for row in range(size - 1)])
+
+
+def testConcurrentSearchesKeepTheirOwnStatistics():
+    searches = [(createMaze(64, 32), 0, 64 * 64 - 1), (createMaze(32, 16), 0, 31)]
+    expected = [SingleAgent().solve(graph, 2, start, goal) for graph, start, goal in searches]
+
+    agent = SingleAgent()
+    results = [[] for _ in searches]
+
+    def run(index):
+        graph, start, goal = searches[index]
+        for _ in range(20):
+            results[index].append(agent.solve(graph, 2, start, goal))
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(len(searches))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for index, result in enumerate(expected):
+        for other in results[index]:
+            assert other.statistics == result.statistics
+            assert other.solution == result.solution
@@ -0,0 +1,37 @@
+import pytest
+
+from src.model.Solver import Solver
+
+
+def createInstance(obstacles=(), start=(0, 0), goal=(3, 4), search="cbs"):
+    return {"id": "bounds", "width": 5, "height": 4, "obstacles": [list(cell) for cell in obstacles],
+            "agents": {"agent1": {"start": list(start), "goal": list(goal)}}, "search": search}
+
+
+@pytest.mark.parametrize("cell", [(4, 0), (0, 5), (-1, 0), (0, -1)])
+def testCreateGraphRejectsObstaclesOutside(cell):
+    with pytest.raises(ValueError):
+        Solver().createGraph(5, 4, [cell])
+
+
+@pytest.mark.parametrize("search", ["cbs", "astar"])
+@pytest.mark.parametrize("points", [{"start": (4, 0)}, {"start": (-1, 2)}, {"goal": (0, 5)}, {"goal": (3, -1)}])
+def testSolveInstanceReportsAgentsOutside(search, points):
+    result = Solver().solveInstance(createInstance(search=search, **points))
+    assert result["status"] == "error"
+    assert "ValueError" in result["error"]
+
+
+@pytest.mark.parametrize("cell", [(4, 4), (-1, 1)])
+def testSolveInstanceReportsObstaclesOutside(cell):
+    result = Solver().solveInstance(createInstance(obstacles=[cell]))
+    assert result["status"] == "error"
+    assert "ValueError" in result["error"]
+
+
+@pytest.mark.parametrize("search", ["cbs", "astar"])
+def testSolveInstanceInsideBounds(search):
+    result = Solver().solveInstance(createInstance(obstacles=[(1, 1)], search=search))
+    assert result["status"] == "solved"
+    assert result["paths"]["agent1"][0] == [0, 0]
+    assert result["paths"]["agent1"][-1] == [3, 4]